@@ -1,24 +1,59 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory, session # <-- Ensure 'session' is imported!
+from flask import Flask, Response, abort, render_template, request, redirect, url_for, flash, session, jsonify # <-- Ensure 'session' is imported!
 import os
-from datetime import datetime
+import gc
+import time
+import secrets
+import itertools
+import zipfile
+import click
+import numpy as np
+from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from flask_sqlalchemy import SQLAlchemy
 import re
+import html
 from PyPDF2 import PdfReader
 import string
-from sqlalchemy import func
-from werkzeug.utils import secure_filename
+from sqlalchemy import event, func, insert, inspect, select, tuple_
+from sqlalchemy.orm import defer, raiseload, validates
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from werkzeug.utils import secure_filename, safe_join
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
+from text_cache import ResumeTextCache, file_sha256
+from blob_store import BlobStore
+from screening_queue import ScreeningQueue
+from skill_matcher import SkillMatcher
+from nlp_service import NlpService
+from pagination import keyset_page
+from db_connector import engine_options
+from upload_stream import StreamingUploadRequest, UploadRejected, accepts_upload, spool_stream, spooled_upload
+from export_stream import ENCODERS, EXPORT_FORMATS, stream_rows
+from file_serving import init_file_serving, send_stored_file
+from bulk_import import iter_source, iter_zip, iter_directory
+from query_counter import init_query_counter, query_budget
+from profiling import init_profiling, profiled
+from metrics import init_metrics
+from query_plans import check_queries
 
 # ✅ NLP/ML imports
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from tfidf_index import TfidfIndex
+from score_matrix import ScoreMatrix
+from screening_memo import ScreeningMemo, text_sha256
 
-app = Flask(__name__)
+# SMARTHIRE_INSTANCE_PATH moves the instance folder (caches, indexes, blobs), e.g. for benchmarks
+INSTANCE_PATH = os.environ.get("SMARTHIRE_INSTANCE_PATH")
+app = Flask(__name__, instance_path=os.path.abspath(INSTANCE_PATH) if INSTANCE_PATH else None)
 app.secret_key = "secret123"
+app.request_class = StreamingUploadRequest  # Uploaded files stream to disk in chunks (see upload_stream.py)
 
 # ✅ Database setup
-app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql+pymysql://root:@localhost/smarthire'
+# Override with SMARTHIRE_DATABASE_URL (same variable as db_connector.py), e.g. sqlite:///bench.db
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get("SMARTHIRE_DATABASE_URL", 'mysql+pymysql://root:@localhost/smarthire')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Same bounded pool (size, recycle, pre-ping) as the raw-SQL helpers in db_connector.py
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 db = SQLAlchemy(app)
 
 # -------------------- DATABASE MODELS --------------------
@@ -26,9 +61,22 @@ class User(db.Model):
     __tablename__ = 'User'
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(255), nullable=False)
+    # Lowercased copy of username with a unique index, so case-insensitive
+    # login/signup lookups are an index seek instead of LOWER() over every row
+    username_lower = db.Column(db.String(255), nullable=False, unique=True, index=True)
     password = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(50), nullable=False)
 
+    @validates('username')
+    def _sync_username_lower(self, key, username):
+        self.username_lower = username.lower()
+        return username
+
+# Accounts the app creates for itself: they cannot log in, and signup may not take their names
+SYSTEM_ROLE = "system"
+BULK_IMPORT_USERNAME = "bulk_import"
+RESERVED_USERNAMES = {BULK_IMPORT_USERNAME}
+
 def is_hashed(password):
     # Detect if the password is already hashed (scrypt or pbkdf2)
     return password.startswith("scrypt:") or password.startswith("pbkdf2:")
@@ -43,6 +91,9 @@ def hash_plaintext_passwords():
     print("All plain-text passwords have been hashed successfully.")
 
 # -----------------------------------------------------
+# Normalized job statuses (Job.status_key); Job.status keeps the capitalised label shown in the UI
+JOB_STATUSES = ("pending", "approved")
+
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
@@ -52,12 +103,25 @@ class Job(db.Model):
     job_type = db.Column(db.String(50), default="Full-Time")
     salary = db.Column(db.String(50), default="Negotiable")
     status = db.Column(db.String(20), default='Pending')
+    # Lowercased copy of status with an index, so status filters and per-status
+    # counts match whatever capitalisation was written ('Approved', 'approved')
+    status_key = db.Column(db.String(20), nullable=False, default='pending')
     employer_id = db.Column(db.Integer, db.ForeignKey('employer.id'), nullable=False)
     employer = db.relationship('Employer', backref='jobs')
 
     # ✅ Add this field for date posted
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_job_status_key_created_at_id', 'status_key', 'created_at', 'id'),  # Approved/pending pages
+        db.Index('ix_job_created_at_id', 'created_at', 'id'),  # Dashboard keyset pages
+    )
+
+    @validates('status')
+    def _sync_status_key(self, key, status):
+        self.status_key = (status or "").lower()
+        return status
+
 # --- Profile Models (Must come before Application if referenced by it) ---
 class Applicant(db.Model):
     __tablename__ = "applicant"
@@ -67,6 +131,8 @@ class Applicant(db.Model):
     email = db.Column(db.String(100), nullable=False)
     skills = db.Column(db.String(255), nullable=True)
     experience = db.Column(db.String(50), nullable=True)
+    # Sign-up time, for the applicants-per-day rollup (NULL for profiles created before it was recorded)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<Applicant {self.fullname}>"
@@ -90,8 +156,23 @@ class Resume(db.Model):
     filename = db.Column(db.String(255), nullable=False)
     owner_name = db.Column(db.String(150)) 
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # SHA-256 of the PDF, i.e. its blob in the blob store (NULL for files not folded in yet)
+    content_hash = db.Column(db.String(64), db.ForeignKey('resume_blob.content_hash'), nullable=True, index=True)
     applicant = db.relationship('Applicant', backref='resumes')
 
+    __table_args__ = (
+        db.Index('ix_resume_applicant_id', 'applicant_id'),
+        db.Index('ix_resume_filename', 'filename'),  # Downloads look resumes up by filename
+    )
+
+class ResumeBlob(db.Model):
+    # One row per distinct PDF in the blob store; ref_count = number of Resume rows using it
+    __tablename__ = "resume_blob"
+    content_hash = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.Integer, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 # --- Application Model ---
 class Application(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -103,6 +184,10 @@ class Application(db.Model):
     # applicant_profile relationship is set by Applicant.applications backref
     job = db.relationship('Job', backref='applications', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_application_applicant_id_job_id', 'applicant_id', 'job_id'),
+    )
+
 class Screening(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     # The ID of the resume that was screened
@@ -115,9 +200,127 @@ class Screening(db.Model):
     matched_skills = db.Column(db.Text) # Storing a comma-separated list of skills
     match_score = db.Column(db.Float)
     screened_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Screening memo key (SHA-256 of the resume PDF and of job_description_text, scorer version)
+    resume_hash = db.Column(db.String(64))
+    job_description_hash = db.Column(db.String(64))
+    scorer_version = db.Column(db.Integer)
+    # One row per resume, job, job description and scorer version: screening again refreshes it
+    screening_key = db.Column(db.String(64))
+    # Set when the job's description changed after this screening; cleared once it is rescored
+    is_stale = db.Column(db.Boolean, nullable=False, default=False)
     resume = db.relationship('Resume', backref='screenings')
     job = db.relationship('Job', backref='screenings')
 
+    __table_args__ = (
+        db.Index('ix_screening_screened_at_id', 'screened_at', 'id'),  # Dashboard keyset pages
+        db.Index('ix_screening_job_id_match_score', 'job_id', 'match_score'),  # Screenings per job, best first
+        db.Index('ix_screening_job_id_screened_at_id', 'job_id', 'screened_at', 'id'),  # One job's export, oldest first
+        db.Index('ix_screening_resume_id', 'resume_id'),
+        db.Index('ix_screening_memo', 'job_description_hash', 'scorer_version', 'resume_hash'),
+        db.Index('ix_screening_stale', 'is_stale', 'job_id', 'screened_at', 'id'),  # Pending rescoring, newest first
+        db.UniqueConstraint('screening_key', name='uq_screening_screening_key'),
+    )
+
+class JobSkill(db.Model):
+    # Inverted index from canonical skill to job, used for the "matched jobs" lookup.
+    # Rows are rewritten whenever a job is submitted, edited, approved or deleted.
+    __tablename__ = "job_skill"
+    skill = db.Column(db.String(100), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True, index=True)
+
+class DashboardRollup(db.Model):
+    # Precomputed admin dashboard counts, one row per (metric, bucket): e.g.
+    # ('jobs_by_status', 'approved'), ('applicants_by_day', '2025-03-01'),
+    # ('screenings_by_job', '42'), ('records', 'resumes'). Kept current by
+    # track_dashboard_rollups below; 'flask rebuild-dashboard-rollups' recounts.
+    __tablename__ = "dashboard_rollup"
+    metric = db.Column(db.String(50), primary_key=True)
+    bucket = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_dashboard_rollup_metric_value', 'metric', 'value', 'bucket'),  # Largest buckets first
+    )
+
+ROLLUP_RECORDS = "records"
+ROLLUP_JOBS_BY_STATUS = "jobs_by_status"
+ROLLUP_APPLICANTS_BY_DAY = "applicants_by_day"
+ROLLUP_SCREENINGS_BY_JOB = "screenings_by_job"
+
+def rollup_buckets(obj):
+    """The (metric, bucket) counters one row contributes 1 to"""
+    if isinstance(obj, Applicant):
+        buckets = [(ROLLUP_RECORDS, "applicants")]
+        if obj.created_at:
+            buckets.append((ROLLUP_APPLICANTS_BY_DAY, obj.created_at.date().isoformat()))
+        return buckets
+    if isinstance(obj, Employer):
+        return [(ROLLUP_RECORDS, "employers")]
+    if isinstance(obj, Resume):
+        return [(ROLLUP_RECORDS, "resumes")]
+    if isinstance(obj, Job):
+        return [(ROLLUP_JOBS_BY_STATUS, obj.status_key)]
+    if isinstance(obj, Screening) and obj.job_id is not None:
+        return [(ROLLUP_SCREENINGS_BY_JOB, str(obj.job_id))]
+    return []
+
+def apply_rollup_deltas(connection, deltas, dropped=()):
+    """
+    Add {(metric, bucket): delta} to the stored rollups, then delete the dropped
+    (metric, bucket) rows. The additions are one upsert, so two transactions
+    creating the same new bucket (two sign-ups on a new day) both succeed
+    instead of racing an UPDATE-then-INSERT into a key conflict.
+    """
+    table = DashboardRollup.__table__
+    rows = [
+        {"metric": metric, "bucket": bucket, "value": delta}
+        for (metric, bucket), delta in sorted(deltas.items()) if delta  # Sorted: same lock order everywhere
+    ]
+    dialect = connection.dialect.name
+    if rows and dialect == "mysql":
+        statement = mysql.insert(table).values(rows)
+        connection.execute(statement.on_duplicate_key_update(value=table.c.value + statement.inserted.value))
+    elif rows and dialect in ("sqlite", "postgresql"):
+        statement = (sqlite if dialect == "sqlite" else postgresql).insert(table).values(rows)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.bucket], set_={"value": table.c.value + statement.excluded.value}
+        ))
+    else:
+        for row in rows:
+            match = (table.c.metric == row["metric"]) & (table.c.bucket == row["bucket"])
+            if not connection.execute(table.update().where(match).values(value=table.c.value + row["value"])).rowcount:
+                connection.execute(table.insert().values(**row))
+    for metric, bucket in dropped:
+        connection.execute(table.delete().where((table.c.metric == metric) & (table.c.bucket == bucket)))
+
+@event.listens_for(db.session, "after_flush")
+def track_dashboard_rollups(session, flush_context):
+    """
+    Keep the rollups in step with every ORM flush, in the same transaction:
+    rows added or deleted count +1/-1 in their buckets, a job whose status
+    changed moves between status buckets, and a deleted job's screenings
+    bucket goes away (its screenings lose their job_id). Bulk INSERT/UPDATE
+    statements bypass this; their callers use apply_rollup_deltas directly.
+    """
+    deltas, dropped = Counter(), []
+    for obj in session.new:
+        deltas.update(rollup_buckets(obj))
+    for obj in session.deleted:
+        deltas.subtract(rollup_buckets(obj))
+        if isinstance(obj, Job):
+            dropped.append((ROLLUP_SCREENINGS_BY_JOB, str(obj.id)))
+    for obj in session.dirty:
+        if isinstance(obj, Job):
+            metric, history = ROLLUP_JOBS_BY_STATUS, inspect(obj).attrs.status_key.history
+        elif isinstance(obj, Screening):
+            metric, history = ROLLUP_SCREENINGS_BY_JOB, inspect(obj).attrs.job_id.history
+        else:
+            continue
+        deltas.update((metric, str(value)) for value in history.added if value is not None)
+        deltas.subtract((metric, str(value)) for value in history.deleted if value is not None)
+    if deltas or dropped:
+        apply_rollup_deltas(session.connection(), deltas, dropped)
+
 # -------------------- FILE FOLDERS --------------------
 # Define the base directory of the current script (app.py)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -133,11 +336,140 @@ os.makedirs(SCREENING_FOLDER, exist_ok=True)
 # Update Flask configuration (if not already done later in the code)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Largest resume accepted; Werkzeug rejects bigger request bodies (413) before reading them
+app.config.setdefault('RESUME_MAX_BYTES', 10 * 1024 * 1024)
+app.config.setdefault('MAX_CONTENT_LENGTH', app.config['RESUME_MAX_BYTES'] + 64 * 1024)  # + room for form fields
+
+# Resume PDFs are stored once per distinct content (sharded by SHA-256); Resume.filename
+# stays the name shown and downloaded. Uploads are spooled next to the blobs so the
+# final move is a rename.
+app.config.setdefault('RESUME_BLOB_DIR', os.path.join(app.instance_path, "blobs"))
+blob_store = BlobStore(app.config['RESUME_BLOB_DIR'])
+app.config.setdefault('UPLOAD_SPOOL_DIR', blob_store.tmp_dir)
+# Blob files with no ResumeBlob row (left by a crash between storing and committing) are
+# removed by 'flask fold-resume-duplicates' once untouched this long; younger ones may
+# belong to an upload whose transaction is still open
+app.config.setdefault('BLOB_ORPHAN_GRACE_SECONDS', 3600)
+
+# Resume downloads can be handed to the front proxy (FILE_OFFLOAD, see file_serving.py);
+# for X-Accel-Redirect each folder needs a matching internal nginx location
+init_file_serving(app, locations={
+    app.config['RESUME_BLOB_DIR']: "/_protected/blobs/",
+    UPLOAD_FOLDER: "/_protected/uploads/",
+    SCREENING_FOLDER: "/_protected/screenings/",
+})
+
+# Bulk resume import (admin endpoint / 'flask import-resumes'): largest ZIP accepted over
+# HTTP, and the only server directory tree the endpoint may read from (None = disabled)
+app.config.setdefault('BULK_IMPORT_MAX_BYTES', 500 * 1024 * 1024)
+app.config.setdefault('BULK_IMPORT_ROOT', None)
+
+# Extracted resume text, keyed by the SHA-256 of the PDF so each file is parsed once
+app.config.setdefault('RESUME_TEXT_CACHE_DIR', os.path.join(app.instance_path, "text_cache"))
+app.config.setdefault('RESUME_TEXT_CACHE_MAX_BYTES', 200 * 1024 * 1024)
+resume_text_cache = ResumeTextCache(
+    app.config['RESUME_TEXT_CACHE_DIR'],
+    max_bytes=app.config['RESUME_TEXT_CACHE_MAX_BYTES']
+)
+
+# Corpus-wide TF-IDF model (vocabulary, IDF and a vector per resume/job), read from disk on first use
+app.config.setdefault('TFIDF_INDEX_PATH', os.path.join(app.instance_path, "tfidf_index.npz"))
+tfidf_index = TfidfIndex(app.config['TFIDF_INDEX_PATH'])
+
+# Resume x job match scores for every approved job, kept current as resumes and jobs
+# change, so "best k candidates for a job" never screens the whole corpus
+app.config.setdefault('SCORE_MATRIX_PATH', os.path.join(app.instance_path, "score_matrix.npz"))
+app.config.setdefault('TOP_CANDIDATES_K', 20)  # Default k of the ranking endpoint
+app.config.setdefault('TOP_CANDIDATES_MAX', 200)  # Largest k it accepts
+score_matrix = ScoreMatrix(app.config['SCORE_MATRIX_PATH'])
+
+# Background screening queue (consumed by 'flask screening-worker')
+app.config.setdefault('SCREENING_QUEUE_PATH', os.path.join(app.instance_path, "screening_queue.db"))
+app.config.setdefault('SCREENING_BACKGROUND', False)  # True = always queue instead of screening inline
+# A running task whose worker has not sent a heartbeat for this long is re-queued by the next
+# worker to start (sooner when the worker's pid is gone on this host); heartbeats go out 4x as often
+app.config.setdefault('SCREENING_TASK_STALE_SECONDS', 120)
+screening_queue = ScreeningQueue(app.config['SCREENING_QUEUE_PATH'])
+
 # -------------------- SKILL KEYWORDS --------------------
-SKILL_KEYWORDS = [
-    "python", "java", "c++", "flask", "django", "machine learning",
-    "deep learning", "data analysis", "sql", "nlp", "react", "aws"
-]
+# Skills and professions (with synonyms) live in data/skill_taxonomy.json and are
+# compiled once into a single-pass matcher
+app.config.setdefault('SKILL_TAXONOMY_PATH', os.path.join(BASE_DIR, "data", "skill_taxonomy.json"))
+skill_matcher = SkillMatcher.from_file(app.config['SKILL_TAXONOMY_PATH'])
+SKILL_KEYWORDS = skill_matcher.canonical["skill"]
+
+# How many jobs the "matched jobs" section of a screening result shows
+app.config.setdefault('MATCHED_JOBS_LIMIT', 10)
+
+# Rows per page in the dashboard tables (and the most a single fetch may ask for)
+app.config.setdefault('DASHBOARD_PAGE_SIZE', 20)
+app.config.setdefault('DASHBOARD_MAX_PAGE_SIZE', 100)
+
+# SQL statements per request are counted (and logged) in debug/testing mode;
+# SQL_QUERY_BUDGET is the default ceiling, @query_budget overrides it per view
+init_query_counter(app)
+
+# Per-request stage timings (Server-Timing header, JSON log line, sampled cProfile dumps);
+# off unless PROFILING_ENABLED / SMARTHIRE_PROFILING=1. Must run before the @profiled functions below.
+init_profiling(app)
+
+# Prometheus metrics at /metrics (request counts and latencies per endpoint plus the
+# ones below), merged across gunicorn workers and the screening worker through METRICS_DIR
+metrics_registry = init_metrics(app)
+resume_uploads_total = metrics_registry.counter(
+    "smarthire_resume_uploads_total", "Resume uploads, by result.", ("result",)
+)
+screenings_total = metrics_registry.counter(
+    "smarthire_screenings_total", "Resumes screened, by how the screening ran.", ("mode",)
+)
+logins_total = metrics_registry.counter("smarthire_logins_total", "Login attempts, by result.", ("result",))
+screening_stage_seconds = metrics_registry.histogram(
+    "smarthire_screening_stage_seconds", "Time spent in each stage of a single screening.", ("stage",)
+)
+
+def cache_requests():
+    """Lookups of this process's caches: (cache, hit|miss) -> count"""
+    memo = screening_memo.stats()
+    return {
+        ("screening_memo", "hit"): memo["memory_hits"] + memo["persistent_hits"],
+        ("screening_memo", "miss"): memo["misses"],
+        ("resume_text", "hit"): resume_text_cache.hits,
+        ("resume_text", "miss"): resume_text_cache.misses,
+        ("entities", "hit"): nlp_service.cache_hits,
+        ("entities", "miss"): nlp_service.cache_misses,
+    }
+
+def cache_hit_ratios(merged):
+    """Hit ratio of each cache over all processes, from the summed lookup counters"""
+    lookups = {}
+    for (cache, result), count in merged.get("smarthire_cache_requests_total", {}).items():
+        hits, total = lookups.get(cache, (0, 0))
+        lookups[cache] = (hits + (count if result == "hit" else 0), total + count)
+    return {cache: hits / total for cache, (hits, total) in lookups.items() if total}
+
+def db_pool_connections():
+    """Connections of this process's SQLAlchemy pool by state (None for pools that do not track them)"""
+    with app.app_context():
+        pool = db.engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {"checked_out": pool.checkedout(), "idle": pool.checkedin(), "size": pool.size()}
+
+metrics_registry.counter(
+    "smarthire_cache_requests_total", "Cache lookups, by cache and result.", ("cache", "result"), fn=cache_requests
+)
+metrics_registry.gauge(
+    "smarthire_cache_hit_ratio", "Share of cache lookups answered from the cache.", ("cache",),
+    fn=cache_hit_ratios, scope="global"
+)
+metrics_registry.gauge(
+    "smarthire_db_pool_connections", "Database pool connections, summed over processes.", ("state",),
+    fn=db_pool_connections
+)
+metrics_registry.gauge(
+    "smarthire_screening_queue_depth", "Screening tasks waiting for the worker.",
+    fn=lambda merged: screening_queue.depth(), scope="global"
+)
 
 # -------------------- AUTH --------------------
 
@@ -150,12 +482,13 @@ def do_login():
     username = request.form.get("username", "").strip()
     password = request.form.get("password", "")
 
-    user = User.query.filter(func.lower(User.username) == username.lower()).first()
+    user = User.query.filter(User.username_lower == username.lower()).first()
 
     if user and user.password == password:
         session["user_id"] = user.id
         session["role"] = user.role
         print(f"✅ Logged in as: {user.username} (role={user.role})")
+        logins_total.inc(result="success")
 
         if user.role == "admin":
             return redirect(url_for("admin_dashboard"))
@@ -168,6 +501,7 @@ def do_login():
             return redirect(url_for("login"))
 
     # If we reach here, login failed
+    logins_total.inc(result="failure")
     flash("❌ Invalid username or password", "error")
     return redirect(url_for("login"))
 
@@ -179,8 +513,12 @@ def signup():
         password = request.form["password"]
         user_role = request.form.get("role", "applicant")  # default 'applicant'
 
+        if username.lower() in RESERVED_USERNAMES:
+            flash("That username is reserved.", "error")
+            return redirect(url_for("signup"))
+
         # Check if username exists
-        existing_user = User.query.filter(func.lower(User.username) == username.lower()).first()
+        existing_user = User.query.filter(User.username_lower == username.lower()).first()
         if existing_user:
             flash("Username already exists!", "error")
             return redirect(url_for("signup"))
@@ -246,6 +584,7 @@ def logout():
 # -------------------- DASHBOARDS --------------------
 from flask import session # Make sure this is imported
 @app.route("/dashboard/employer")
+@query_budget(10)
 def employer_dashboard():
     if 'user_id' not in session or session.get('role') != 'employer':
         flash("Unauthorized access. Please log in as an employer.", "error")
@@ -256,30 +595,120 @@ def employer_dashboard():
         flash("Employer profile not found.", "error")
         return redirect(url_for("login"))
 
-    # Fetches ALL jobs from the database for viewing
-    jobs_list = Job.query.order_by(Job.created_at.desc()).all()
-
-    resumes_list = Resume.query.all()
-    screenings_list = Screening.query.order_by(Screening.screened_at.desc()).all()
-
+    # Stats cards come from COUNT(*) queries; the tables only load their first page
+    # here and fetch further pages from the JSON endpoints below on demand
     stats = {
-        "uploaded_resumes": len(resumes_list),
-        "screened_resumes": len(screenings_list),
-        "job_posts": len(jobs_list)
+        "uploaded_resumes": uploaded_resumes_query().count(),
+        "screened_resumes": Screening.query.count(),
+        "job_posts": Job.query.count()
     }
+    page_size = app.config['DASHBOARD_PAGE_SIZE']
+    jobs_page, jobs_cursor = keyset_page(dashboard_jobs_query(), [Job.created_at, Job.id], limit=page_size)
+    resumes_page, resumes_cursor = keyset_page(uploaded_resumes_query(), [Resume.id], limit=page_size)
+    screenings_page, screenings_cursor = keyset_page(dashboard_screenings_query(), [Screening.screened_at, Screening.id], limit=page_size)
+
+    # The "link to job post" dropdown only needs ids and titles
+    job_options = db.session.query(Job.id, Job.title).order_by(Job.created_at.desc()).all()
 
     return render_template(
         "employer_dashboard.html",
         employer=employer,
-        jobs=jobs_list,
-        resumes=resumes_list,
-        screenings=screenings_list,
+        jobs=jobs_page,
+        jobs_cursor=jobs_cursor,
+        resumes=resumes_page,
+        resumes_cursor=resumes_cursor,
+        screenings=screenings_page,
+        screenings_cursor=screenings_cursor,
+        job_options=job_options,
         stats=stats,
         shortlisted=[],
         interviews=[]
     )
 
+# Dashboard rows only show their own columns. raiseload('*') turns any relationship a
+# template starts walking into an error instead of one lazy SELECT per row, so the
+# loader strategy has to be chosen here (joinedload/selectinload) when it is needed.
+def dashboard_jobs_query():
+    return Job.query.options(raiseload('*'))
+
+def dashboard_screenings_query():
+    # The stored job description can be large and is never shown in the table
+    return Screening.query.options(defer(Screening.job_description_text), raiseload('*'))
+
+def uploaded_resumes_query():
+    """Resumes uploaded by applicants (manual 'screen_' uploads are filtered out in SQL)"""
+    return Resume.query.options(raiseload('*')).filter(Resume.filename.notlike('screen\\_%', escape='\\'))
+
+def dashboard_page_args():
+    """Cursor and page size requested by a dashboard table fetch"""
+    limit = request.args.get("limit", app.config['DASHBOARD_PAGE_SIZE'], type=int)
+    return request.args.get("after"), max(1, min(limit, app.config['DASHBOARD_MAX_PAGE_SIZE']))
+
+@app.route("/dashboard/employer/jobs")
+def employer_dashboard_jobs():
+    """JSON page of the job postings table (newest first)"""
+    if session.get('role') != 'employer':
+        return jsonify({"error": "Unauthorized access."}), 403
+    cursor, limit = dashboard_page_args()
+    jobs, next_cursor = keyset_page(dashboard_jobs_query(), [Job.created_at, Job.id], cursor, limit)
+    return jsonify({
+        "items": [{
+            "id": job.id,
+            "title": job.title,
+            "company": job.company,
+            "status": job.status,
+            "created_at": job.created_at.strftime('%Y-%m-%d %H:%M:%S') if job.created_at else None,
+            "edit_url": url_for('edit_job', job_id=job.id),
+            "delete_url": url_for('delete_job', job_id=job.id)
+        } for job in jobs],
+        "next_cursor": next_cursor
+    })
+
+@app.route("/dashboard/employer/resumes")
+def employer_dashboard_resumes():
+    """JSON page of the uploaded resumes table (newest first)"""
+    if session.get('role') != 'employer':
+        return jsonify({"error": "Unauthorized access."}), 403
+    cursor, limit = dashboard_page_args()
+    resumes, next_cursor = keyset_page(uploaded_resumes_query(), [Resume.id], cursor, limit)
+    return jsonify({
+        "items": [{
+            "id": resume.id,
+            "applicant_id": resume.applicant_id,
+            "owner_name": resume.owner_name,
+            "filename": resume.filename,
+            "download_url": url_for('download_resume', filename=resume.filename),
+            "delete_url": url_for('delete_resume', resume_id=resume.id)
+        } for resume in resumes],
+        "next_cursor": next_cursor
+    })
+
+@app.route("/dashboard/employer/screenings")
+def employer_dashboard_screenings():
+    """JSON page of the screened resumes table (newest first), optionally above a minimum score"""
+    if session.get('role') != 'employer':
+        return jsonify({"error": "Unauthorized access."}), 403
+    cursor, limit = dashboard_page_args()
+    query = dashboard_screenings_query()
+    min_score = request.args.get("min_score", type=float)
+    if min_score is not None:
+        query = query.filter(Screening.match_score > min_score)
+    screenings, next_cursor = keyset_page(query, [Screening.screened_at, Screening.id], cursor, limit)
+    return jsonify({
+        "items": [{
+            "id": s.id,
+            "owner_name": s.owner_name,
+            "matched_skills": s.matched_skills,
+            "match_score": s.match_score,
+            "is_stale": s.is_stale,
+            "screened_at": s.screened_at.strftime('%Y-%m-%d %H:%M') if s.screened_at else None,
+            "delete_url": url_for('delete_screening', screening_id=s.id)
+        } for s in screenings],
+        "next_cursor": next_cursor
+    })
+
 @app.route("/dashboard/applicant")
+@query_budget(5)
 def applicant_dashboard():
     # ⚠️ Check if user is logged in and is an applicant
     if 'user_id' not in session or session.get('role') != 'applicant':
@@ -293,10 +722,12 @@ def applicant_dashboard():
         return redirect(url_for("login"))
 
         # Fetch all active jobs
-    jobs = Job.query.filter(Job.status == "Approved").all()
+    jobs = Job.query.options(raiseload('*')).filter(Job.status_key == "approved").all()
 
-    # Optional: fetch jobs already applied to by this applicant
-    applied_job_ids = [app.job_id for app in Application.query.filter_by(applicant_id=applicant.id).all()]
+    # Only the ids of the jobs already applied to (marks their Apply buttons)
+    applied_job_ids = [
+        job_id for job_id, in db.session.query(Application.job_id).filter_by(applicant_id=applicant.id)
+    ]
 
     return render_template(
         "applicant_dashboard.html",
@@ -306,30 +737,187 @@ def applicant_dashboard():
     )
 
 @app.route("/dashboard/admin")
+@query_budget(8)
 def admin_dashboard():
-    applicants_list = Applicant.query.all()
-    employers_list = Employer.query.all()
-   
-    approved_jobs = Job.query.filter_by(status='approved').all()
-    pending_jobs = Job.query.filter_by(status='pending').all()
+    # Stats and activity come from the precomputed rollups (one SELECT); every table
+    # loads its first page here and further pages from the JSON endpoints below, so
+    # the page costs the same however many users, jobs and screenings there are
+    rollups = admin_rollups()
+    stats = {
+        "applicants": rollups[ROLLUP_RECORDS].get("applicants", 0),
+        "employers": rollups[ROLLUP_RECORDS].get("employers", 0),
+        "resumes": rollups[ROLLUP_RECORDS].get("resumes", 0),
+        "jobs": sum(rollups[ROLLUP_JOBS_BY_STATUS].values()),
+    }
+    jobs_by_status = {status: rollups[ROLLUP_JOBS_BY_STATUS].get(status, 0) for status in JOB_STATUSES}
+    applicants_by_day = sorted(rollups[ROLLUP_APPLICANTS_BY_DAY].items(), reverse=True)
 
-    # Combine approved + pending for the dashboard detailed records
-    all_jobs = approved_jobs + pending_jobs
+    page_size = app.config['DASHBOARD_PAGE_SIZE']
+    approved_jobs, approved_cursor = keyset_page(admin_jobs_query("approved"), [Job.created_at, Job.id], limit=page_size)
+    pending_jobs, pending_cursor = keyset_page(admin_jobs_query("pending"), [Job.created_at, Job.id], limit=page_size)
+    applicants, applicants_cursor = keyset_page(Applicant.query.options(raiseload('*')), [Applicant.id], limit=page_size)
+    employers, employers_cursor = keyset_page(Employer.query.options(raiseload('*')), [Employer.id], limit=page_size)
+    screenings_per_job, screenings_per_job_cursor = screenings_per_job_page(None, page_size)
 
     return render_template(
         'admin_dashboard.html',
-        applicants_list=applicants_list,
-        employers_list=employers_list,
+        stats=stats,
+        jobs_by_status=jobs_by_status,
+        applicants_by_day=applicants_by_day,
         approved_jobs=approved_jobs,
+        approved_cursor=approved_cursor,
         pending_jobs=pending_jobs,
-        all_jobs=all_jobs
+        pending_cursor=pending_cursor,
+        applicants_list=applicants,
+        applicants_cursor=applicants_cursor,
+        employers_list=employers,
+        employers_cursor=employers_cursor,
+        screenings_per_job=screenings_per_job,
+        screenings_per_job_cursor=screenings_per_job_cursor
     )
 
+# Days of sign-ups shown in the admin dashboard's activity table
+app.config.setdefault('ADMIN_ACTIVITY_DAYS', 30)
+
+def admin_rollups():
+    """{metric: {bucket: value}} for the admin stats: record totals, jobs per status, recent sign-ups per day"""
+    since = (datetime.utcnow() - timedelta(days=app.config['ADMIN_ACTIVITY_DAYS'] - 1)).date().isoformat()
+    rows = DashboardRollup.query.filter(db.or_(
+        DashboardRollup.metric.in_([ROLLUP_RECORDS, ROLLUP_JOBS_BY_STATUS]),
+        db.and_(DashboardRollup.metric == ROLLUP_APPLICANTS_BY_DAY, DashboardRollup.bucket >= since)
+    ))
+    rollups = {ROLLUP_RECORDS: {}, ROLLUP_JOBS_BY_STATUS: {}, ROLLUP_APPLICANTS_BY_DAY: {}}
+    for row in rows:
+        rollups[row.metric][row.bucket] = row.value
+    return rollups
+
+def admin_jobs_query(status_key):
+    return Job.query.options(raiseload('*')).filter(Job.status_key == status_key)
+
+def screenings_per_job_page(cursor, limit):
+    """One keyset page of [(job id, job title or None if deleted, screenings)], most screened first"""
+    rows, next_cursor = keyset_page(
+        DashboardRollup.query.filter(DashboardRollup.metric == ROLLUP_SCREENINGS_BY_JOB),
+        [DashboardRollup.value, DashboardRollup.bucket], cursor, limit
+    )
+    job_ids = [int(row.bucket) for row in rows]
+    titles = dict(db.session.query(Job.id, Job.title).filter(Job.id.in_(job_ids))) if job_ids else {}
+    return [(job_id, titles.get(job_id), row.value) for job_id, row in zip(job_ids, rows)], next_cursor
+
+def admin_json_page(query, sort_columns, serialize):
+    """JSON page of one admin table (the caller checks the role)"""
+    cursor, limit = dashboard_page_args()
+    rows, next_cursor = keyset_page(query, sort_columns, cursor, limit)
+    return jsonify({"items": [serialize(row) for row in rows], "next_cursor": next_cursor})
+
+@app.route("/dashboard/admin/jobs")
+def admin_dashboard_jobs():
+    """JSON page of the approved or pending (?status=) job posts, newest first"""
+    if session.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access."}), 403
+    status_key = request.args.get("status", "approved").lower()
+    if status_key not in JOB_STATUSES:
+        return jsonify({"error": f"Unknown job status '{status_key}'."}), 400
+    return admin_json_page(admin_jobs_query(status_key), [Job.created_at, Job.id], lambda job: {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "status": job.status,
+        "created_at": job.created_at.strftime('%Y-%m-%d') if job.created_at else None,
+        "approve_url": url_for('approve_job', job_id=job.id),
+        "archive_url": url_for('archive_job', job_id=job.id)
+    })
+
+@app.route("/dashboard/admin/applicants")
+def admin_dashboard_applicants():
+    """JSON page of applicant profiles, newest first"""
+    if session.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access."}), 403
+    return admin_json_page(Applicant.query.options(raiseload('*')), [Applicant.id], lambda applicant: {
+        "id": applicant.id,
+        "fullname": applicant.fullname,
+        "email": applicant.email,
+        "skills": applicant.skills,
+        "experience": applicant.experience
+    })
+
+@app.route("/dashboard/admin/employers")
+def admin_dashboard_employers():
+    """JSON page of employer profiles, newest first"""
+    if session.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access."}), 403
+    return admin_json_page(Employer.query.options(raiseload('*')), [Employer.id], lambda employer: {
+        "id": employer.id,
+        "fullname": employer.fullname,
+        "email": employer.email,
+        "company": employer.company
+    })
+
+@app.route("/dashboard/admin/resumes")
+def admin_dashboard_resumes():
+    """JSON page of every uploaded resume, newest first"""
+    if session.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access."}), 403
+    return admin_json_page(Resume.query.options(raiseload('*')), [Resume.id], lambda resume: {
+        "id": resume.id,
+        "filename": resume.filename,
+        "owner_name": resume.owner_name,
+        "uploaded_at": resume.uploaded_at.strftime('%Y-%m-%d') if resume.uploaded_at else None
+    })
+
+@app.route("/dashboard/admin/screenings_per_job")
+def admin_dashboard_screenings_per_job():
+    """JSON page of the screenings-per-job rollup, most screened jobs first"""
+    if session.get('role') != 'admin':
+        return jsonify({"error": "Unauthorized access."}), 403
+    cursor, limit = dashboard_page_args()
+    rows, next_cursor = screenings_per_job_page(cursor, limit)
+    return jsonify({
+        "items": [{"job_id": job_id, "title": title, "screenings": screenings} for job_id, title, screenings in rows],
+        "next_cursor": next_cursor
+    })
+
+def rebuild_dashboard_rollups():
+    """Recount every rollup from the base tables with grouped COUNTs and replace the stored rows (caller commits)"""
+    counts = {
+        (ROLLUP_RECORDS, "applicants"): Applicant.query.count(),
+        (ROLLUP_RECORDS, "employers"): Employer.query.count(),
+        (ROLLUP_RECORDS, "resumes"): Resume.query.count(),
+    }
+    for status_key, count in db.session.query(Job.status_key, func.count()).group_by(Job.status_key):
+        counts[(ROLLUP_JOBS_BY_STATUS, status_key)] = count
+    day = func.date(Applicant.created_at)
+    for signup_day, count in db.session.query(day, func.count()).filter(Applicant.created_at.isnot(None)).group_by(day):
+        counts[(ROLLUP_APPLICANTS_BY_DAY, str(signup_day))] = count
+    screenings = db.session.query(Screening.job_id, func.count()).filter(Screening.job_id.isnot(None))
+    for job_id, count in screenings.group_by(Screening.job_id):
+        counts[(ROLLUP_SCREENINGS_BY_JOB, str(job_id))] = count
+
+    DashboardRollup.query.delete()
+    db.session.execute(insert(DashboardRollup), [
+        {"metric": metric, "bucket": bucket, "value": value} for (metric, bucket), value in counts.items()
+    ])
+    return counts
+
 # -------------------- RESUMES --------------------
+def send_resume_file(filename, folder, as_attachment=False):
+    """Send a resume by its filename: from the blob store once folded in, else from the legacy folder"""
+    resume = Resume.query.filter_by(filename=filename).first()
+    if resume and resume.content_hash:
+        # A blob is named by the hash of its bytes and a resume's blob never changes:
+        # the hash is a strong ETag and the file can be cached for good
+        return send_stored_file(blob_store.path(resume.content_hash), filename, as_attachment,
+                                etag=resume.content_hash, immutable=True)
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    return send_stored_file(path, filename, as_attachment)
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    """Serve uploaded resumes from UPLOAD_FOLDER"""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """Serve uploaded resumes from the blob store (or UPLOAD_FOLDER)"""
+    return send_resume_file(filename, app.config['UPLOAD_FOLDER'])
 
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
@@ -353,40 +941,63 @@ def upload_resume():
     if file.filename == '':
         flash("No file selected!", "error")
         return redirect(url_for("applicant_dashboard"))
+    content_hash = None
     try:
         # ✅ Make filename safe and unique
         filename = secure_filename(f"{applicant.fullname}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{file.filename}")
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
 
-        # ✅ Ensure the upload folder exists
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        # ✅ The file was already streamed to a temp file (hashed, size- and PDF-checked);
+        # store it in the blob store, where identical bytes are kept only once
+        upload = spooled_upload(file, app.config['UPLOAD_SPOOL_DIR'], app.config['RESUME_MAX_BYTES'])
+        content_hash = acquire_resume_blob(upload)
+        filepath = blob_store.path(content_hash)
 
-        # ✅ Save the file
-        file.save(filepath)
+        # ✅ Parse the PDF once now so later screenings hit the text cache
+        resume_text = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf, content_hash=content_hash)
 
         # ✅ Save in DB
         new_resume = Resume(
             applicant_id=applicant.id,
             filename=filename,
-            owner_name=applicant.fullname
+            owner_name=applicant.fullname,
+            content_hash=content_hash
         )
 
         db.session.add(new_resume)
         db.session.commit()
 
+        # ✅ Add it to the corpus TF-IDF index
+        index_documents({resume_index_key(new_resume.id): resume_text})
+        update_resume_scores([new_resume.id])
+
+        resume_uploads_total.inc(result="success")
         flash("✅ Resume uploaded successfully!", "success")
         return redirect(url_for("applicant_dashboard"))
 
+    except UploadRejected as e:
+        resume_uploads_total.inc(result="rejected")
+        flash(f"Error uploading resume: {e}", "error")
+        return redirect(url_for("applicant_dashboard"))
     except Exception as e:
         db.session.rollback()
+        if content_hash:
+            # Stored before the failed commit: drop the file unless another upload's row now owns it
+            purge_resume_blob(content_hash)
+        resume_uploads_total.inc(result="error")
         flash(f"Error uploading resume: {e}", "error")
         return redirect(url_for("applicant_dashboard"))
 
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    limit_mb = app.config['RESUME_MAX_BYTES'] // (1024 * 1024)
+    flash(f"Error uploading resume: file is larger than {limit_mb} MB.", "error")
+    return redirect(request.referrer or url_for("login"))
+
 @app.route("/download_resume/<filename>")
 def download_resume(filename):
-    """Download uploaded resumes from UPLOAD_FOLDER"""
+    """Download uploaded resumes from the blob store (or UPLOAD_FOLDER)"""
     try:
-        return send_from_directory(UPLOAD_FOLDER, filename, as_attachment=True)
+        return send_resume_file(filename, UPLOAD_FOLDER, as_attachment=True)
     except FileNotFoundError:
         flash("Resume file not found.", "error")
         return redirect(url_for("employer_dashboard"))
@@ -397,15 +1008,26 @@ def delete_resume(resume_id):
     # ✅ NEW LOGIC: Fetch and delete the Resume object
     resume = Resume.query.get(resume_id)
     if resume:
-        # Delete the file from the filesystem first
-        filepath = os.path.join(UPLOAD_FOLDER, resume.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)            
+        content_hash = resume.content_hash
+        if content_hash:
+            # Shared blob: only removed once no other resume uses the same file
+            last_reference = release_resume_blob(content_hash)
+        else:
+            # Legacy file: delete it from the filesystem first
+            last_reference = False
+            filepath = os.path.join(UPLOAD_FOLDER, resume.filename)
+            if os.path.exists(filepath):
+                resume_text_cache.invalidate_file(filepath)
+                os.remove(filepath)            
 
         # Delete the record from the database
         owner_name = resume.owner_name
         db.session.delete(resume)
         db.session.commit()
+        if last_reference:
+            purge_resume_blob(content_hash)
+        unindex_documents([resume_index_key(resume_id)])
+        drop_scores(resume_ids=[resume_id])
       
         flash(f"{owner_name}'s resume deleted successfully.", "success")
     else:
@@ -457,7 +1079,10 @@ def submit_job():
     )
 
     db.session.add(new_job)
+    db.session.flush()  # to get new_job.id
+    index_job_skills(new_job)
     db.session.commit()
+    index_documents({job_index_key(new_job.id): new_job.description or ""})
     flash(f"✅ Job '{title}' added successfully!", "success")
     return redirect(url_for("employer_dashboard"))
 
@@ -477,14 +1102,28 @@ def edit_job(job_id):
 
     if request.method == "POST":
         # 3. Handle POST Request (Form Submission/Update)
+        old_description_hash = text_sha256(job.description or "")
         job.title = request.form.get("title")
         job.company = request.form.get("company")
         job.location = request.form.get("location")
         job.job_type = request.form.get("job_type")
         job.salary = request.form.get("salary")
         job.description = request.form.get("description")
+        index_job_skills(job)
+        description_changed = text_sha256(job.description or "") != old_description_hash
+        if description_changed:
+            mark_screenings_stale(job)
         
         db.session.commit()
+        index_documents({job_index_key(job.id): job.description or ""})
+        if job.status_key == "approved":
+            update_job_scores([job.id])
+        if description_changed and not app.config['RESCORE_BACKGROUND']:
+            try:
+                rescore_stale_screenings(job.id)
+            except Exception as e:
+                # The edit is saved; the rows stay stale for the worker or 'flask rescore-stale-screenings'
+                flash(f"Job saved, but its screenings could not be rescored yet: {e}", "error")
         
         flash(f"✅ Job '{job.title}' updated successfully!", "success")
         return redirect(url_for("employer_dashboard"))
@@ -499,8 +1138,11 @@ def delete_job(job_id):
     # ✅ NEW LOGIC: Query and delete the Job object
     job = Job.query.get(job_id)
     if job:
+        unindex_job_skills(job.id)
         db.session.delete(job)
         db.session.commit() # Commit the deletion
+        unindex_documents([job_index_key(job_id)])
+        drop_scores(job_ids=[job_id])
         flash(f"Job {job_id} deleted successfully.", "success")
     else:
         flash(f"Job not found.", "error")
@@ -511,31 +1153,57 @@ def delete_job(job_id):
 def approve_job(job_id):
     job = Job.query.get_or_404(job_id)
     job.status = "Approved"
+    index_job_skills(job)
     db.session.commit()
+    index_documents({job_index_key(job.id): job.description or ""}, only_missing=True)
+    update_job_scores([job.id])
     flash(f"✅ Job '{job.title}' approved successfully!", "success")
     return redirect(url_for("admin_dashboard"))
 
 @app.route('/archive_job/<int:job_id>', methods=['POST'])
 def archive_job(job_id):
     job = Job.query.get_or_404(job_id)  # Adjust 'Job' to your model name
+    unindex_job_skills(job.id)
     db.session.delete(job)  # Or mark as archived if you have a column
     db.session.commit()
+    unindex_documents([job_index_key(job_id)])
+    drop_scores(job_ids=[job_id])
     flash(f"Job ID {job_id} archived successfully!", "success")
     return redirect(url_for('admin_dashboard'))
 
 # -------------------- RESUME SCREENING --------------------
-import spacy
-
-# Load spaCy English model for optional NLP detection of professions
-nlp = spacy.load("en_core_web_sm")
-
-# List of common professions/job titles to detect
-PROFESSIONS = [
-    "engineer", "developer", "manager", "analyst", "designer",
-    "consultant", "technician", "administrator", "specialist",
-    "scientist", "coordinator", "assistant", "officer", "intern"
-]
-
+# spaCy English model for optional NLP detection of professions. It is loaded on
+# the first screening rather than at import time, so migrations, admin scripts
+# and workers that only serve dashboards never pay for it. Only the components
+# entity recognition needs are loaded, and entities are cached per text.
+app.config.setdefault('NLP_ENTITY_CACHE_DIR', os.path.join(app.instance_path, "entity_cache"))
+app.config.setdefault('NLP_BATCH_SIZE', 32)  # Documents per nlp.pipe batch
+app.config.setdefault('NLP_N_PROCESS', 1)  # Processes nlp.pipe may use for large batches
+nlp_service = NlpService(
+    cache_dir=app.config['NLP_ENTITY_CACHE_DIR'],
+    batch_size=app.config['NLP_BATCH_SIZE'],
+    n_process=app.config['NLP_N_PROCESS']
+)
+
+def get_nlp():
+    """Return the shared (trimmed) spaCy pipeline, loading it on first use"""
+    return nlp_service.nlp
+
+def preload_nlp_stack():
+    """
+    Load spaCy, scikit-learn and the TF-IDF index up front. Called in the
+    gunicorn master (see gunicorn.conf.py) and before the screening worker
+    forks, so child processes share the loaded pages copy-on-write.
+    """
+    get_nlp()
+    tfidf_index.preload()
+    # Keep the garbage collector from touching (and so copying) the shared objects
+    gc.freeze()
+
+# Common professions/job titles to detect (the "profession" category of the taxonomy)
+PROFESSIONS = skill_matcher.canonical["profession"]
+
+@profiled("pdf")
 def extract_text_from_pdf(filepath):
     """Extract text from PDF file"""
     try:
@@ -548,24 +1216,164 @@ def extract_text_from_pdf(filepath):
 
 
 
-def calculate_ai_match_score(resume_text, job_description):
-    """Calculate matched skills and TF-IDF similarity score"""
-    translator = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
-    resume_clean = resume_text.lower().translate(translator)
-    job_clean = job_description.lower().translate(translator)
+PUNCTUATION_TRANSLATOR = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+def clean_text(text):
+    """Lowercase text and replace punctuation with spaces before matching/TF-IDF"""
+    return text.lower().translate(PUNCTUATION_TRANSLATOR)
+
+def match_skill_keywords(text):
+    """Return the canonical skills (synonyms included) found in text"""
+    return skill_matcher.skills_in(text, category="skill")
+
+def resume_index_key(resume_id):
+    return f"resume:{resume_id}"
+
+def job_index_key(job_id):
+    return f"job:{job_id}"
+
+@profiled("index")
+def index_documents(documents, only_missing=False):
+    """Add/refresh {index key: raw text} in the corpus TF-IDF index (one save for all)"""
+    try:
+        if only_missing:
+            tfidf_index.refresh()
+            documents = {key: text for key, text in documents.items() if key not in tfidf_index}
+        if documents:
+            tfidf_index.update(add={key: clean_text(text) for key, text in documents.items()})
+    except Exception as e:
+        print("TF-IDF index update error:", e)
+
+def unindex_documents(keys):
+    """Drop deleted resumes/jobs from the corpus TF-IDF index"""
+    try:
+        tfidf_index.update(remove=keys)
+    except Exception as e:
+        print("TF-IDF index update error:", e)
+
+def indexed_resume_ids():
+    """Ids of every resume in the corpus TF-IDF index"""
+    tfidf_index.refresh()
+    return [int(key.split(":", 1)[1]) for key in list(tfidf_index.docs) if key.startswith("resume:")]
+
+def score_block(job_ids, resume_ids):
+    """
+    Match scores (0-100) of resumes against jobs from the corpus index, as
+    {job id: (resume ids, scores)} with zero scores left out. One sparse
+    jobs x resumes product; the rows are L2-normalised, so it is the cosine.
+    """
+    tfidf_index.refresh()
+    resume_ids = np.asarray(resume_ids, dtype=np.int64)
+    jobs = tfidf_index.matrix([job_index_key(job_id) for job_id in job_ids])
+    resumes = tfidf_index.matrix([resume_index_key(resume_id) for resume_id in resume_ids])
+    block = (jobs @ resumes.T).tocsr()
+    columns = {}
+    for row, job_id in enumerate(job_ids):
+        start, end = block.indptr[row], block.indptr[row + 1]
+        columns[job_id] = (resume_ids[block.indices[start:end]], block.data[start:end] * 100)
+    return columns
+
+def update_job_scores(job_ids):
+    """(Re)compute the score matrix columns of approved jobs against every indexed resume"""
+    try:
+        score_matrix.update(columns=score_block(job_ids, indexed_resume_ids()))
+    except Exception as e:
+        print("Score matrix update error:", e)
+
+def update_resume_scores(resume_ids):
+    """Score new resumes against every job in the score matrix"""
+    try:
+        job_ids = score_matrix.job_ids()
+        if job_ids and resume_ids:
+            score_matrix.update(merge=score_block(job_ids, resume_ids))
+    except Exception as e:
+        print("Score matrix update error:", e)
+
+def drop_scores(job_ids=(), resume_ids=()):
+    """Remove deleted/unapproved jobs and deleted resumes from the score matrix"""
+    try:
+        score_matrix.update(remove_jobs=job_ids, remove_resumes=resume_ids)
+    except Exception as e:
+        print("Score matrix update error:", e)
+
+def job_skills(job):
+    """Canonical skills/professions mentioned in a job's title, company and description"""
+    return skill_matcher.skills_in(f"{job.title or ''} {job.company or ''} {job.description or ''}")
+
+def index_job_skills(job):
+    """Rewrite a job's rows in the skill -> job inverted index (caller commits)"""
+    unindex_job_skills(job.id)
+    db.session.add_all(JobSkill(skill=skill, job_id=job.id) for skill in job_skills(job))
+
+def unindex_job_skills(job_id):
+    """Remove a job from the skill -> job inverted index (caller commits)"""
+    JobSkill.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+
+def find_matched_jobs(skills, limit):
+    """Top jobs by number of shared canonical skills, from the inverted index"""
+    if not skills:
+        return []
+    overlap = func.count(JobSkill.skill).label("overlap")
+    ranked = (
+        db.session.query(JobSkill.job_id, overlap)
+        .filter(JobSkill.skill.in_(skills))
+        .group_by(JobSkill.job_id)
+        .order_by(overlap.desc(), JobSkill.job_id.desc())
+        .limit(limit)
+        .all()
+    )
+    job_ids = [job_id for job_id, _ in ranked]
+    jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+    return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+
+def tfidf_vector(key, text_clean):
+    """Precomputed index vector for key, or an on-the-fly vector for unindexed text"""
+    vector = tfidf_index.vector(key) if key else None
+    return vector if vector is not None else tfidf_index.vectorize(text_clean)
+
+@profiled("score")
+def calculate_ai_match_score(resume_text, job_description, resume_key=None, job_key=None):
+    """
+    Calculate matched skills and TF-IDF similarity score. When the resume/job
+    are in the corpus index the score is a dot product of their stored vectors.
+    """
+    resume_clean = clean_text(resume_text)
+    job_clean = clean_text(job_description)
 
     # Match predefined skills
-    matched = [skill for skill in SKILL_KEYWORDS if re.search(r'\b' + re.escape(skill.lower()) + r'\b', resume_clean)]
+    matched = match_skill_keywords(resume_text)
     try:
-        vectorizer = TfidfVectorizer(stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform([resume_clean, job_clean])
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+        tfidf_index.refresh()
+        similarity = tfidf_index.similarity(
+            tfidf_vector(resume_key, resume_clean),
+            tfidf_vector(job_key, job_clean)
+        )
         score = round(similarity * 100, 2)
     except Exception as e:
         print("TF-IDF similarity error:", e)
         score = 0.0
     return matched, score
 
+@profiled("score")
+def score_resumes_against_job(resume_texts, job_description, resume_keys, job_key=None):
+    """
+    Batch version of calculate_ai_match_score: stacks the indexed vectors of
+    every resume (resume_keys must already be in the corpus index) and scores
+    them with a single sparse matrix-vector product. Returns a list of
+    (matched_skills, score) in the same order as resume_texts.
+    """
+    resume_cleans = [clean_text(text) for text in resume_texts]
+    job_clean = clean_text(job_description)
+    matched = [match_skill_keywords(text) for text in resume_texts]
+    try:
+        tfidf_index.refresh()
+        similarities = tfidf_index.scores(resume_keys, tfidf_vector(job_key, job_clean))
+        scores = [round(float(sim) * 100, 2) for sim in similarities]
+    except Exception as e:
+        print("TF-IDF similarity error:", e)
+        scores = [0.0] * len(resume_texts)
+    return list(zip(matched, scores))
+
 def extract_contact_info(text):
     """Extract email and phone number from resume"""
     emails = re.findall(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}", text)
@@ -574,28 +1382,360 @@ def extract_contact_info(text):
     phone = phones[0] if phones else "Not detected"
     return email, phone
 
-def extract_professions(resume_text):
+@profiled("ner")
+def extract_professions(resume_text, entities=None):
 
-    """Detect professions/job titles from resume"""
+    """Detect professions/job titles from resume (entities: precomputed nlp_service result, if any)"""
     resume_text_lower = resume_text.lower()
-    matched = set()
-    # Method 1: simple keyword matching
-    for prof in PROFESSIONS:
-        if prof in resume_text_lower:
-            matched.add(prof)
-
-    # Method 2: optional NLP entity recognition for future enhancement
-    doc = nlp(resume_text_lower)
-    for ent in doc.ents:
-        if ent.label_ in ["ORG", "WORK_OF_ART", "PRODUCT"]:
-            for prof in PROFESSIONS:
-                if prof in ent.text.lower():
-                    matched.add(prof)
+    # Method 1: taxonomy matching (one pass over the text)
+    matched = set(skill_matcher.skills_in(resume_text_lower, category="profession"))
+
+    # Method 2: optional NLP entity recognition (ORG/WORK_OF_ART/PRODUCT, cached per text)
+    if entities is None:
+        entities = nlp_service.entities(resume_text_lower)
+    for ent_text, _ in entities:
+        matched.update(skill_matcher.skills_in(ent_text, category="profession"))
 
     return list(matched)
 
+@profiled("ner")
+def extract_professions_many(resume_texts):
+    """extract_professions for many resumes, with all uncached NER done in nlp.pipe batches"""
+    entities = nlp_service.entities_many([text.lower() for text in resume_texts])
+    return [extract_professions(text, ents) for text, ents in zip(resume_texts, entities)]
+
+HIGHLIGHT_OPEN_TAG = "<mark style='background:#FFD54F;padding:0.05rem 0.15rem;border-radius:0.15rem;'>"
+
+@profiled("highlight")
+def highlight_matches(text, matches):
+    """
+    Build the highlighted resume HTML in a single linear pass: every match span is
+    wrapped in <mark>, all text is HTML-escaped, and a span overlapping an earlier
+    (or longer, same-start) one is skipped.
+    """
+    parts = []
+    pos = 0
+    for match in sorted(matches, key=lambda m: (m.start, m.start - m.end)):
+        if match.start < pos:
+            continue
+        parts.append(html.escape(text[pos:match.start], quote=False))
+        parts.append(HIGHLIGHT_OPEN_TAG)
+        parts.append(html.escape(text[match.start:match.end], quote=False))
+        parts.append("</mark>")
+        pos = match.end
+    parts.append(html.escape(text[pos:], quote=False))
+    return "".join(parts)
+
+def resolve_resume_filepath(resume):
+    """Return the path of a resume's PDF on disk, or None if it is missing"""
+    if resume.content_hash:
+        filepath = blob_store.path(resume.content_hash)
+        return filepath if os.path.exists(filepath) else None
+    filepath = os.path.join(UPLOAD_FOLDER, resume.filename)
+    if not os.path.exists(filepath):
+        # Fallback to checking the SCREENING_FOLDER if UPLOAD_FOLDER is empty
+        filepath = os.path.join(SCREENING_FOLDER, resume.filename)
+        if not os.path.exists(filepath):
+            return None
+    return filepath
+
+# -------------------- RESUME BLOBS --------------------
+def acquire_resume_blob(upload):
+    """
+    Put a finished upload in the blob store and count one more reference to it.
+    The count is committed together with the caller's Resume row; if that
+    commit fails the caller calls purge_resume_blob after rolling back.
+    """
+    upload.check()
+    content_hash = upload.sha256
+    # Row lock first, so a concurrent delete of the last reference cannot unlink the file we reuse
+    blob = db.session.get(ResumeBlob, content_hash, with_for_update=True)
+    if blob is None:
+        blob = ResumeBlob(content_hash=content_hash, size=upload.size, ref_count=0)
+        db.session.add(blob)
+    blob_store.put_upload(upload)
+    blob.ref_count += 1
+    return content_hash
+
+def release_resume_blob(content_hash):
+    """Drop one reference to a blob; returns True if it was the last (call purge_resume_blob after commit)"""
+    blob = db.session.get(ResumeBlob, content_hash, with_for_update=True)
+    if blob is None:
+        return False
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return False
+    db.session.delete(blob)
+    return True
+
+def purge_resume_blob(content_hash):
+    """Delete an unreferenced blob's file and cached text, unless it was re-acquired meanwhile"""
+    if db.session.get(ResumeBlob, content_hash) is None:
+        blob_store.delete(content_hash)
+        resume_text_cache.invalidate(content_hash)
+
+# -------------------- SCREENING MEMO --------------------
+# Bump when scoring or skill extraction changes; results memoized by older versions are then ignored
+SCORER_VERSION = 1
+
+# Editing a job's description rescores its screenings: inline after the edit, or (True)
+# by 'flask screening-worker' in batches of RESCORE_BATCH_SIZE, rows marked stale meanwhile
+app.config.setdefault('RESCORE_BACKGROUND', False)
+app.config.setdefault('RESCORE_BATCH_SIZE', 1000)
+# After a rescoring pass fails, the worker leaves stale rows alone for this many seconds
+app.config.setdefault('RESCORE_RETRY_SECONDS', 60)
+
+# Re-screening the same resume bytes against the same job description reuses the
+# earlier result: an in-process LRU in front of the Screening table itself
+app.config.setdefault('SCREENING_MEMO_MAX_ENTRIES', 4096)
+
+def load_memoized_screenings(keys):
+    """Persistent memo tier: results already stored in the Screening table, by (resume hash, JD hash, version)"""
+    groups = {}
+    for resume_hash, job_description_hash, version in keys:
+        groups.setdefault((job_description_hash, version), set()).add(resume_hash)
+    found = {}
+    for (job_description_hash, version), resume_hashes in groups.items():
+        rows = (
+            db.session.query(Screening.resume_hash, Screening.matched_skills, Screening.match_score)
+            .filter(
+                Screening.job_description_hash == job_description_hash,
+                Screening.scorer_version == version,
+                Screening.resume_hash.in_(resume_hashes)
+            )
+        )
+        for resume_hash, matched_skills, match_score in rows:
+            found[(resume_hash, job_description_hash, version)] = {
+                "matched_skills": [s for s in (matched_skills or "").split(", ") if s],
+                "match_score": match_score
+            }
+    return found
+
+screening_memo = ScreeningMemo(load_memoized_screenings, max_entries=app.config['SCREENING_MEMO_MAX_ENTRIES'])
+
+def resume_content_hash(resume, filepath):
+    """SHA-256 of a resume's PDF (kept on the row once it is in the blob store)"""
+    return resume.content_hash or file_sha256(filepath)
+
+def screening_memo_key(resume_hash, job_description):
+    return (resume_hash, text_sha256(job_description), SCORER_VERSION)
+
+def screening_row(resume, resume_hash, job_id, job_description, result):
+    """Column values of the Screening row for one result"""
+    job_description_hash = text_sha256(job_description)
+    return {
+        "resume_id": resume.id,
+        "job_id": job_id,
+        "owner_name": resume.owner_name,
+        "job_description_text": job_description,
+        "matched_skills": ", ".join(result["matched_skills"]),  # Convert list to string for DB
+        "match_score": result["match_score"],
+        "screened_at": datetime.utcnow(),
+        "resume_hash": resume_hash,
+        "job_description_hash": job_description_hash,
+        "scorer_version": SCORER_VERSION,
+        "screening_key": text_sha256(f"{resume.id}|{job_id or ''}|{job_description_hash}|{SCORER_VERSION}")
+    }
+
+REFRESHED_SCREENING_FIELDS = ("owner_name", "matched_skills", "match_score", "screened_at")
+
+def save_screening(row):
+    """Insert a Screening row, or refresh the one with the same screening_key (caller commits)"""
+    screening = Screening.query.filter_by(screening_key=row["screening_key"]).first()
+    if screening is None:
+        screening = Screening(**row)
+        db.session.add(screening)
+    else:
+        for field in REFRESHED_SCREENING_FIELDS:
+            setattr(screening, field, row[field])
+    return screening
+
+def save_screenings(rows):
+    """save_screening for many rows: one lookup, then a single bulk INSERT for the new ones (caller commits)"""
+    rows = {row["screening_key"]: row for row in rows}
+    existing = Screening.query.filter(Screening.screening_key.in_(rows)).all() if rows else []
+    for screening in existing:
+        row = rows.pop(screening.screening_key)
+        for field in REFRESHED_SCREENING_FIELDS:
+            setattr(screening, field, row[field])
+    if rows:
+        db.session.execute(insert(Screening), list(rows.values()))
+        # A bulk INSERT is not an ORM flush, so count the new rows in the rollups here
+        apply_rollup_deltas(db.session.connection(), Counter(
+            (ROLLUP_SCREENINGS_BY_JOB, str(row["job_id"])) for row in rows.values() if row["job_id"] is not None
+        ))
+
+def store_screening_result(task, resume, resume_hash, result):
+    """Save a queued screening's result and mark the task done (or failed if saving fails)"""
+    try:
+        screening = save_screening(screening_row(resume, resume_hash, task["job_id"], task["job_description"], result))
+        db.session.commit()
+        screening_queue.complete(task["id"], screening.id)
+        screenings_total.inc(mode="worker")
+    except Exception as e:
+        db.session.rollback()
+        screening_queue.fail(task["id"], e)
+        print(f"Screening task {task['id']} failed: {e}")
+
+def mark_screenings_stale(job):
+    """Flag the screenings of a job that were scored against another description (caller commits)"""
+    current_hash = text_sha256(job.description or "")
+    return (
+        Screening.query
+        .filter(Screening.job_id == job.id, Screening.is_stale.is_(False))
+        .filter(db.or_(Screening.job_description_hash.is_(None), Screening.job_description_hash != current_hash))
+        .update({Screening.is_stale: True}, synchronize_session=False)
+    )
+
+def rescore_stale_screenings(job_id=None, limit=None):
+    """
+    Rescore stale screenings (of one job, or of any job) in batches, committing
+    after each, and return how many rows were brought up to date. Only the match
+    score depends on the job description, so no PDF or NLP work is done: the
+    resumes' stored TF-IDF vectors are multiplied by the new job vector in one
+    sparse product. limit stops after roughly that many rows have been looked at.
+    Rows that cannot be scored yet stay stale and are passed over, so they are
+    retried on the next call instead of blocking the rows behind them.
+    """
+    batch_size = app.config['RESCORE_BATCH_SIZE']
+    sort_columns = (Screening.job_id, Screening.screened_at, Screening.id)
+    rescored = examined = 0
+    after = None  # Sort key of the last row looked at
+    while limit is None or examined < limit:
+        query = Screening.query.options(raiseload('*')).filter(Screening.is_stale.is_(True))
+        if job_id is not None:
+            query = query.filter(Screening.job_id == job_id)
+        if after is not None:
+            query = query.filter(tuple_(*sort_columns) < tuple_(*after))
+        batch = query.order_by(*[column.desc() for column in sort_columns]).limit(batch_size).all()
+        if not batch:
+            break
+        after = (batch[-1].job_id, batch[-1].screened_at, batch[-1].id)
+        try:
+            for batch_job_id, screenings in itertools.groupby(batch, key=lambda s: s.job_id):
+                rescored += rescore_job_screenings(db.session.get(Job, batch_job_id), list(screenings))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        examined += len(batch)
+    return rescored
+
+def rescore_job_screenings(job, screenings):
+    """
+    Update stale screenings (newest first) to the job's current description and
+    return how many were brought up to date (caller commits). Screenings whose
+    job or resume has no vector in the corpus index (e.g. indexing failed, or the
+    resume file is gone) are left stale rather than given a score of zero.
+    """
+    if job is None:
+        # Job deleted meanwhile: nothing to rescore against, the rows keep their last score
+        for screening in screenings:
+            screening.is_stale = False
+        return len(screenings)
+    job_key = job_index_key(job.id)
+    index_documents({job_key: job.description or ""}, only_missing=True)
+    # Resumes screened before the corpus index existed are indexed from the text cache
+    tfidf_index.refresh()
+    unindexed = {}
+    for screening in screenings:
+        key = resume_index_key(screening.resume_id)
+        if key not in tfidf_index and key not in unindexed:
+            resume = db.session.get(Resume, screening.resume_id)
+            filepath = resolve_resume_filepath(resume) if resume else None
+            if filepath:
+                unindexed[key] = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf)
+    index_documents(unindexed, only_missing=True)
+    job_vector = tfidf_index.vector(job_key)
+    if job_vector is None:
+        print(f"Rescoring skipped for job {job.id}: its description is not in the corpus index.")
+        return 0
+    screenings = [s for s in screenings if resume_index_key(s.resume_id) in tfidf_index]
+    similarities = tfidf_index.scores([resume_index_key(s.resume_id) for s in screenings], job_vector)
+
+    job_description_hash = text_sha256(job.description or "")
+    # Rows already holding the new key (e.g. the description was edited back) win over stale copies
+    taken = {key for key, in db.session.query(Screening.screening_key).filter(
+        Screening.job_id == job.id, Screening.is_stale.is_(False), Screening.job_description_hash == job_description_hash
+    )}
+    for screening, similarity in zip(screenings, similarities):
+        key = text_sha256(f"{screening.resume_id}|{job.id}|{job_description_hash}|{SCORER_VERSION}")
+        if key in taken:
+            db.session.delete(screening)  # Duplicate of a current row
+            continue
+        taken.add(key)
+        screening.match_score = round(float(similarity) * 100, 2)
+        screening.job_description_text = job.description
+        screening.job_description_hash = job_description_hash
+        screening.scorer_version = SCORER_VERSION
+        screening.screening_key = key
+        screening.is_stale = False
+        if screening.resume_hash:
+            screening_memo.put((screening.resume_hash, job_description_hash, SCORER_VERSION), {
+                "matched_skills": [s for s in (screening.matched_skills or "").split(", ") if s],
+                "match_score": screening.match_score
+            })
+    return len(screenings)
+
+def run_screening_pipeline(filepath, resume_id, job_id, job_description):
+    """CPU-heavy part of a screening: PDF text, contact info, matched skills/professions and AI score"""
+    with screening_stage_seconds.time(stage="text"):
+        resume_text = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf)
+        email, phone = extract_contact_info(resume_text)
+
+    # Make sure both sides have precomputed vectors in the corpus index
+    resume_key = resume_index_key(resume_id)
+    job_key = job_index_key(job_id) if job_id else None
+    documents = {resume_key: resume_text}
+    if job_key:
+        documents[job_key] = job_description
+    with screening_stage_seconds.time(stage="index"):
+        index_documents(documents, only_missing=True)
+
+    # Calculate matched skills and AI score
+    with screening_stage_seconds.time(stage="score"):
+        matched_skills, match_score = calculate_ai_match_score(resume_text, job_description, resume_key, job_key)
+
+    # Extract professions and merge with matched skills
+    with screening_stage_seconds.time(stage="ner"):
+        matched_professions = extract_professions(resume_text)
+    return {
+        "resume_text": resume_text,
+        "email": email,
+        "phone": phone,
+        "matched_skills": list(set(matched_skills + matched_professions)),
+        "match_score": match_score
+    }
+
+def screen_resume_task(filepath, resume_id, job_id, job_description):
+    """Entry point run inside the worker process pool (results travel back without the full text)"""
+    result = run_screening_pipeline(filepath, resume_id, job_id, job_description)
+    result.pop("resume_text")
+    return result
+
+def screen_resume(resume, filepath, job_id, job_description):
+    """
+    run_screening_pipeline behind the screening memo. On a hit only the text
+    (from the text cache) and contact details are read back for display.
+    The result also carries the resume's content hash.
+    """
+    with screening_stage_seconds.time(stage="memo"):
+        resume_hash = resume_content_hash(resume, filepath)
+        memo_key = screening_memo_key(resume_hash, job_description)
+        memoized = screening_memo.get(memo_key)
+    if memoized is None:
+        result = run_screening_pipeline(filepath, resume.id, job_id, job_description)
+        screening_memo.put(memo_key, {"matched_skills": result["matched_skills"], "match_score": result["match_score"]})
+    else:
+        resume_text = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf, content_hash=resume_hash)
+        email, phone = extract_contact_info(resume_text)
+        result = dict(memoized, resume_text=resume_text, email=email, phone=phone)
+    result["resume_hash"] = resume_hash
+    return result
+
 @app.route("/upload_screening", methods=["POST"])
 def upload_screening():
+    started = time.perf_counter()
     # 1. Get data from the form
     resume_id = request.form.get("resume_id") # Assume the form now passes the Resume ID
     job_id = request.form.get("job_id")
@@ -623,77 +1763,333 @@ def upload_screening():
         return redirect(url_for("employer_dashboard"))
 
     # 3. Get the file path
-    filepath = os.path.join(UPLOAD_FOLDER, resume.filename)
-    if not os.path.exists(filepath):
-        # Fallback to checking the SCREENING_FOLDER if UPLOAD_FOLDER is empty
-        filepath = os.path.join(SCREENING_FOLDER, resume.filename)
-        if not os.path.exists(filepath):
-            flash(f"Resume file '{resume.filename}' not found on server.", "error")
-            return redirect(url_for("employer_dashboard"))
+    filepath = resolve_resume_filepath(resume)
+    if not filepath:
+        flash(f"Resume file '{resume.filename}' not found on server.", "error")
+        return redirect(url_for("employer_dashboard"))
 
-    # 4. Perform Screening Logic
-    resume_text = extract_text_from_pdf(filepath)
-    email, phone = extract_contact_info(resume_text)
-    # Calculate matched skills and AI score
-    matched_skills, match_score = calculate_ai_match_score(resume_text, job_description)
+    # 4. Hand the work to the background worker when asked to (or configured to)
+    if request.form.get("background") or app.config['SCREENING_BACKGROUND']:
+        task_id = screening_queue.enqueue(resume.id, job.id if job else None, job_description)
+        screenings_total.inc(mode="queued")
+        if request.accept_mimetypes.best == "application/json":
+            return jsonify({
+                "task_id": task_id,
+                "status": "queued",
+                "status_url": url_for("screening_status", task_id=task_id)
+            }), 202
+        flash(f"✅ Screening queued (task #{task_id}). Results will appear in your dashboard shortly.", "success")
+        return redirect(url_for("employer_dashboard"))
 
-    # Extract professions and merge with matched skills
-    matched_professions = extract_professions(resume_text)
-    final_matched_skills = list(set(matched_skills + matched_professions))
-    # 5. Save Screening Record to the Database (NEW LOGIC)
-    try:
-        new_screening = Screening(
-            resume_id=resume.id,
-            job_id=job.id if job else None,
-            owner_name=resume.owner_name,
-            job_description_text=job_description,
-            matched_skills=", ".join(final_matched_skills), # Convert list to string for DB
-            match_score=match_score
+    # Otherwise perform Screening Logic inline (memoized; PDF text comes from the cache after the first parse)
+    result = screen_resume(resume, filepath, job.id if job else None, job_description)
+    resume_text = result["resume_text"]
+    email, phone = result["email"], result["phone"]
+    match_score = result["match_score"]
+    final_matched_skills = result["matched_skills"]
+    screenings_total.inc(mode="inline")
+    # 5. Save Screening Record to the Database (refreshes the row if this exact screening was saved before)
+    with screening_stage_seconds.time(stage="save"):
+        try:
+            save_screening(screening_row(resume, result["resume_hash"], job.id if job else None, job_description, result))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            flash(f"Error saving screening result: {e}", "error")
+            # Continue to display result even if save fails
+       
+    # 6. Prepare data for the results page (one pass over the resume, using match offsets)
+    with screening_stage_seconds.time(stage="highlight"):
+        wanted = set(final_matched_skills)
+        skill_matches = [match for match in skill_matcher.find(resume_text) if match.skill in wanted]
+        highlighted_resume = highlight_matches(resume_text, skill_matches)
+
+    # Top jobs for the matched jobs section (skill -> job inverted index)
+    with screening_stage_seconds.time(stage="matched_jobs"):
+        matched_jobs = find_matched_jobs(final_matched_skills, app.config['MATCHED_JOBS_LIMIT'])
+
+    with screening_stage_seconds.time(stage="render"):
+        page = render_template(
+            "ai_resume_result.html",
+            email=email,
+            phone=phone,
+            score=match_score,
+            matched_skills=final_matched_skills,
+            skills_count=skill_matcher.count(),
+            highlighted_resume=highlighted_resume,
+            matched_jobs=matched_jobs,
+            resume_filename=resume.filename
         )
+    screening_stage_seconds.observe(time.perf_counter() - started, stage="total")
+    return page
+
+@app.route("/upload_screening/batch", methods=["POST"])
+def upload_screening_batch():
+    """Screen many resumes against one job in a single pass and return a ranked shortlist"""
+    if session.get("role") != "employer":
+        return jsonify({"error": "Unauthorized access."}), 403
+
+    # 1. Get data from the form (no resume_ids means every resume on the platform)
+    job_id = request.form.get("job_id", type=int)
+    job_description_text = request.form.get("job_description", "").strip()
+    resume_ids = request.form.getlist("resume_ids", type=int)
+    limit = request.form.get("limit", type=int)
+
+    job = Job.query.get(job_id) if job_id else None
+    if job:
+        job_description = job.description
+    elif job_description_text:
+        job_description = job_description_text
+    else:
+        return jsonify({"error": "Please select a job or provide a job description for screening."}), 400
+
+    query = Resume.query
+    if resume_ids:
+        query = query.filter(Resume.id.in_(resume_ids))
+    resumes = query.all()
 
-        db.session.add(new_screening)
+    # 2. Screen them all and save the Screening rows in one transaction
+    try:
+        shortlist, missing_resume_ids = screen_resumes_against_job(resumes, job, job_description)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
-        flash(f"Error saving screening result: {e}", "error")
-        # Continue to display result even if save fails
-       
-    # 6. Prepare data for the results page
-    highlighted_resume = resume_text
-    for skill in sorted(set(final_matched_skills), key=len, reverse=True):
-        try:
-            highlighted_resume = re.sub(
-                rf"\b({re.escape(skill)})\b",
-                r"<mark style='background:#FFD54F;padding:0.05rem 0.15rem;border-radius:0.15rem;'>\1</mark>",
-                highlighted_resume,
-                flags=re.IGNORECASE
-            )
-        except re.error:
-            continue        
+        return jsonify({"error": f"Error saving screening results: {e}"}), 500
+
+    screened = len(shortlist)
+    if limit:
+        shortlist = shortlist[:limit]
+
+    return jsonify({
+        "job_id": job.id if job else None,
+        "screened": screened,
+        "missing_resume_ids": missing_resume_ids,
+        "shortlist": shortlist
+    })
+
+@app.route("/jobs/<int:job_id>/top_candidates", methods=["GET", "POST"])
+def top_candidates(job_id):
+    """
+    The best k resumes for an approved job, read from the score matrix (no
+    screening needed). POST also screens those k and saves Screening rows.
+    """
+    if session.get("role") != "employer":
+        return jsonify({"error": "Unauthorized access."}), 403
 
-    # Find all jobs for the matched jobs section (now using DB)
-    all_jobs = Job.query.all()
-    matched_jobs = []
-    for j in all_jobs:
-        combined = f"{j.title} {j.company} {j.description}".lower()
-        if any(skill.lower() in combined for skill in final_matched_skills):
-            matched_jobs.append(j)
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found."}), 404
+    if job.status_key != "approved":
+        return jsonify({"error": "Only approved jobs are ranked."}), 409
+    k = request.values.get("k", app.config['TOP_CANDIDATES_K'], type=int)
+    k = max(0, min(k, app.config['TOP_CANDIDATES_MAX']))
+
+    if job.id not in score_matrix:
+        # Approved before the matrix existed (or it was lost): score the job now
+        index_documents({job_index_key(job.id): job.description or ""}, only_missing=True)
+        update_job_scores([job.id])
+    ranked = score_matrix.top_k(job.id, k) or []
+    resume_ids = [resume_id for resume_id, _ in ranked]
+    resumes = {r.id: r for r in Resume.query.options(raiseload('*')).filter(Resume.id.in_(resume_ids))}
+    ranked = [(resumes[resume_id], score) for resume_id, score in ranked if resume_id in resumes]
 
-    return render_template(
-        "ai_resume_result.html",
-        email=email,
-        phone=phone,
-        score=match_score,
-        matched_skills=final_matched_skills,
-        skills_count=len(SKILL_KEYWORDS) + len(PROFESSIONS),
-        highlighted_resume=highlighted_resume,
-        matched_jobs=matched_jobs
+    if request.method == "POST":
+        try:
+            shortlist, missing_resume_ids = screen_resumes_against_job([r for r, _ in ranked], job, job.description)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": f"Error saving screening results: {e}"}), 500
+        return jsonify({
+            "job_id": job.id,
+            "screened": len(shortlist),
+            "missing_resume_ids": missing_resume_ids,
+            "shortlist": shortlist
+        })
+
+    return jsonify({
+        "job_id": job.id,
+        "candidates": [
+            {
+                "resume_id": resume.id,
+                "owner_name": resume.owner_name,
+                "filename": resume.filename,
+                "match_score": score
+            }
+            for resume, score in ranked
+        ]
+    })
+
+def screen_resumes_against_job(resumes, job, job_description):
+    """
+    Screen many resumes against a job (or a free-text description when job is
+    None) in one pass: memoized results first, then cached PDF text, one
+    sparse product for the scores and batched NER for the rest. Saves a
+    Screening row per resume (caller commits) and returns (shortlist best
+    first, ids of resumes whose file is missing).
+    """
+    # 1. Results memoized for the same resume bytes and job description
+    candidates, filepaths, resume_hashes, missing_resume_ids = [], [], [], []
+    for resume in resumes:
+        filepath = resolve_resume_filepath(resume)
+        if not filepath:
+            missing_resume_ids.append(resume.id)
+            continue
+        candidates.append(resume)
+        filepaths.append(filepath)
+        resume_hashes.append(resume_content_hash(resume, filepath))
+    memo_keys = [screening_memo_key(resume_hash, job_description) for resume_hash in resume_hashes]
+    results = screening_memo.get_many(memo_keys)
+
+    # 2. Score the rest with one sparse product over the corpus index (texts cached after the first parse)
+    todo = [i for i, key in enumerate(memo_keys) if key not in results]
+    if todo:
+        resume_texts = [
+            resume_text_cache.get_or_extract(filepaths[i], extract_text_from_pdf, content_hash=resume_hashes[i])
+            for i in todo
+        ]
+        resume_keys = [resume_index_key(candidates[i].id) for i in todo]
+        job_key = job_index_key(job.id) if job else None
+        documents = dict(zip(resume_keys, resume_texts))
+        if job:
+            documents[job_key] = job.description
+        index_documents(documents, only_missing=True)
+        scored = score_resumes_against_job(resume_texts, job_description, resume_keys, job_key)
+        professions = extract_professions_many(resume_texts)
+        for i, (matched_skills, match_score), resume_professions in zip(todo, scored, professions):
+            result = {"matched_skills": list(set(matched_skills + resume_professions)), "match_score": match_score}
+            screening_memo.put(memo_keys[i], result)
+            results[memo_keys[i]] = result
+
+    rows, shortlist = [], []
+    for resume, resume_hash, key in zip(candidates, resume_hashes, memo_keys):
+        result = results[key]
+        rows.append(screening_row(resume, resume_hash, job.id if job else None, job_description, result))
+        shortlist.append({
+            "resume_id": resume.id,
+            "owner_name": resume.owner_name,
+            "filename": resume.filename,
+            "match_score": result["match_score"],
+            "matched_skills": result["matched_skills"]
+        })
+
+    # 3. Save all Screening rows: existing ones refreshed, new ones in a single bulk INSERT
+    save_screenings(rows)
+    screenings_total.inc(len(rows), mode="batch")
+
+    shortlist.sort(key=lambda candidate: candidate["match_score"], reverse=True)
+    return shortlist, missing_resume_ids
+
+@app.route("/screening/status/<int:task_id>")
+def screening_status(task_id):
+    """Poll a queued screening; once done the result is in the Screening table"""
+    if session.get("role") != "employer":
+        return jsonify({"error": "Unauthorized access."}), 403
+
+    task = screening_queue.get(task_id)
+    if not task:
+        return jsonify({"error": "Screening task not found."}), 404
+
+    payload = {
+        "task_id": task["id"],
+        "status": task["status"],
+        "resume_id": task["resume_id"],
+        "job_id": task["job_id"],
+        "screening_id": task["screening_id"],
+        "error": task["error"]
+    }
+    screening = Screening.query.get(task["screening_id"]) if task["screening_id"] else None
+    if screening:
+        payload["match_score"] = screening.match_score
+        payload["matched_skills"] = [s for s in (screening.matched_skills or "").split(", ") if s]
+    return jsonify(payload)
+
+@app.route("/screening/memo_stats")
+def screening_memo_stats():
+    """Hit/miss counters of this process's screening memo"""
+    if session.get("role") not in ("employer", "admin"):
+        return jsonify({"error": "Unauthorized access."}), 403
+    return jsonify(screening_memo.stats())
+
+# Rows fetched per round trip by the screening export's server-side cursor
+app.config.setdefault('EXPORT_BATCH_SIZE', 1000)
+
+EXPORT_SCREENING_COLUMNS = (
+    "screening_id", "resume_id", "owner_name", "job_id", "job_title",
+    "match_score", "matched_skills", "screened_at", "is_stale"
+)
+
+def parse_export_date(value, end=False):
+    """
+    datetime bound for the export's from/to filters (YYYY-MM-DD or an ISO
+    date-time; None when empty). A bare end date is moved to the next midnight
+    so the whole day is included. Raises ValueError for anything else.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+@app.route("/screenings/export")
+def export_screenings():
+    """
+    Download screenings as CSV or NDJSON (?format=csv|ndjson), optionally one
+    job's only (?job_id=) and screened from/to a date, oldest first. Rows are
+    read through a server-side cursor and written out as they arrive, so memory
+    stays flat however many rows match.
+    """
+    if session.get("role") not in ("employer", "admin"):
+        return jsonify({"error": "Unauthorized access."}), 403
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unknown export format '{export_format}'."}), 400
+    try:
+        since = parse_export_date(request.args.get("from"))
+        until = parse_export_date(request.args.get("to"), end=True)
+    except ValueError:
+        return jsonify({"error": "Dates must be YYYY-MM-DD or ISO 8601 date-times."}), 400
+    job_id = request.args.get("job_id", type=int)
+
+    statement = (
+        select(
+            Screening.id.label("screening_id"), Screening.resume_id, Screening.owner_name,
+            Screening.job_id, Job.title.label("job_title"), Screening.match_score,
+            Screening.matched_skills, Screening.screened_at, Screening.is_stale
+        )
+        .select_from(Screening)
+        .outerjoin(Job, Job.id == Screening.job_id)
+    )
+    if job_id is not None:
+        statement = statement.where(Screening.job_id == job_id)
+    if since is not None:
+        statement = statement.where(Screening.screened_at >= since)
+    if until is not None:
+        statement = statement.where(Screening.screened_at < until)
+    statement = statement.order_by(Screening.screened_at, Screening.id)
+
+    # The generator runs after this view returns, on its own pooled connection
+    rows = stream_rows(db.engine, statement, app.config['EXPORT_BATCH_SIZE'])
+    filename = f"screenings-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    return Response(
+        ENCODERS[export_format](rows, EXPORT_SCREENING_COLUMNS),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
+@app.route("/screened_file/<filename>")
+def screened_file(filename):
+    """Show a screened resume inline (the preview on the screening result page)"""
+    try:
+        return send_resume_file(filename, SCREENING_FOLDER)
+    except FileNotFoundError:
+        abort(404)
+
 @app.route("/download_screening/<filename>")
 def download_screening(filename):
     try:
-        return send_from_directory(SCREENING_FOLDER, filename, as_attachment=True)
+        return send_resume_file(filename, SCREENING_FOLDER, as_attachment=True)
     except FileNotFoundError:
         flash("Screening file not found.", "error")
         return redirect(url_for("employer_dashboard"))
@@ -714,6 +2110,160 @@ def delete_screening(screening_id):
         flash("Screening record not found.", "error")
     return redirect(url_for("employer_dashboard"))
 
+# -------------------- BULK RESUME IMPORT --------------------
+def import_resume_task(filepath, content_hash):
+    """Runs in the import process pool: text (through the text cache) and contact info of one stored PDF"""
+    resume_text = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf, content_hash=content_hash)
+    if not resume_text.strip():
+        raise ValueError("No text could be extracted from the PDF.")
+    email, phone = extract_contact_info(resume_text)
+    return {"resume_text": resume_text, "email": email, "phone": phone}
+
+class BulkImportAccountTaken(Exception):
+    """The bulk import username belongs to a regular account, which must not receive imported resumes"""
+
+def bulk_import_applicant():
+    """
+    Applicant profile that owns imported resumes. Its account is found by its
+    system role, never by name alone, and has a random password and no loginable
+    role, so nobody can sign in as it.
+    """
+    user = User.query.filter_by(role=SYSTEM_ROLE, username_lower=BULK_IMPORT_USERNAME).first()
+    if user is None:
+        if User.query.filter_by(username_lower=BULK_IMPORT_USERNAME).first():
+            raise BulkImportAccountTaken(
+                f"The username '{BULK_IMPORT_USERNAME}' belongs to a regular account; rename it "
+                "or pass an applicant to import into."
+            )
+        user = User(username=BULK_IMPORT_USERNAME, password=secrets.token_urlsafe(32), role=SYSTEM_ROLE)
+        db.session.add(user)
+        db.session.flush()
+    applicant = Applicant.query.filter_by(user_id=user.id).first()
+    if applicant is None:
+        applicant = Applicant(user_id=user.id, fullname="Bulk import", email="N/A", skills="N/A", experience="0 years")
+        db.session.add(applicant)
+        db.session.flush()
+    return applicant
+
+def import_resumes(items, applicant=None, processes=None):
+    """
+    Import (name, binary stream) pairs as resumes of applicant (default: the bulk
+    import profile). Each file is streamed into the blob store while a process
+    pool extracts text and contact info from the ones already stored; all Resume
+    rows are then inserted in one transaction. Returns a report with throughput
+    and per-file failures.
+    """
+    started = time.perf_counter()
+    processes = processes or os.cpu_count() or 1
+    stamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+    failures, extracted = [], []
+    stored = set()  # Every blob this import wrote (or found) in the store
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = {}  # future -> (file name, content hash); dicts keep submission order
+        for name, stream in items:
+            upload = spool_stream(stream, app.config['UPLOAD_SPOOL_DIR'], app.config['RESUME_MAX_BYTES'])
+            try:
+                content_hash = blob_store.put_upload(upload)
+            except (UploadRejected, OSError) as e:
+                upload.close()
+                failures.append({"file": name, "error": str(e)})
+                continue
+            stored.add(content_hash)
+            future = pool.submit(import_resume_task, blob_store.path(content_hash), content_hash)
+            pending[future] = (name, content_hash, upload.size)
+        for future, (name, content_hash, size) in pending.items():
+            try:
+                extracted.append((name, content_hash, size, future.result()))
+            except Exception as e:
+                failures.append({"file": name, "error": str(e)})
+
+    # One transaction for the blob reference counts and every Resume row
+    try:
+        applicant = applicant or bulk_import_applicant()
+        counts = Counter(content_hash for _, content_hash, _, _ in extracted)
+        sizes = {content_hash: size for _, content_hash, size, _ in extracted}
+        for content_hash, count in counts.items():
+            blob = db.session.get(ResumeBlob, content_hash, with_for_update=True)
+            if blob is None:
+                blob = ResumeBlob(content_hash=content_hash, size=sizes[content_hash], ref_count=0)
+                db.session.add(blob)
+            blob.ref_count += count
+        resumes = [
+            Resume(
+                applicant_id=applicant.id,
+                filename=secure_filename(f"import_{stamp}_{n:04d}_{os.path.basename(name)}"),
+                owner_name=os.path.splitext(os.path.basename(name))[0].replace("_", " "),
+                content_hash=content_hash
+            )
+            for n, (name, content_hash, _, _) in enumerate(extracted, 1)
+        ]
+        db.session.add_all(resumes)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        # Drop blobs written for files that failed (or for a rolled-back import) that nothing references
+        for content_hash in stored:
+            purge_resume_blob(content_hash)
+    index_documents({
+        resume_index_key(resume.id): result["resume_text"]
+        for resume, (_, _, _, result) in zip(resumes, extracted)
+    })
+    update_resume_scores([resume.id for resume in resumes])
+
+    elapsed = time.perf_counter() - started
+    total = len(extracted) + len(failures)
+    return {
+        "imported": len(resumes),
+        "failed": len(failures),
+        "seconds": round(elapsed, 3),
+        "files_per_second": round(total / elapsed, 2) if elapsed > 0 else None,
+        "resumes": [
+            {"file": name, "resume_id": resume.id, "email": result["email"], "phone": result["phone"]}
+            for resume, (name, _, _, result) in zip(resumes, extracted)
+        ],
+        "failures": failures
+    }
+
+@app.route("/admin/resumes/import", methods=["POST"])
+@accepts_upload(kind="ZIP", max_bytes=app.config['BULK_IMPORT_MAX_BYTES'])
+def admin_import_resumes():
+    """Import a ZIP of resume PDFs (field 'archive') or a directory under BULK_IMPORT_ROOT (field 'directory')"""
+    if session.get("role") != "admin":
+        return jsonify({"error": "Unauthorized access."}), 403
+
+    applicant_id = request.form.get("applicant_id", type=int)
+    applicant = Applicant.query.get(applicant_id) if applicant_id else None
+    if applicant_id and not applicant:
+        return jsonify({"error": "Applicant not found."}), 404
+
+    processes = request.form.get("processes", type=int)
+    archive = request.files.get("archive")
+    directory = request.form.get("directory", "").strip()
+    try:
+        if archive and archive.filename:
+            upload = spooled_upload(archive, app.config['UPLOAD_SPOOL_DIR'], app.config['BULK_IMPORT_MAX_BYTES'], kind="ZIP")
+            upload.check()
+            upload.seek(0)
+            report = import_resumes(iter_zip(upload), applicant, processes)
+        elif directory:
+            root = app.config['BULK_IMPORT_ROOT']
+            path = os.path.realpath(os.path.join(root or "", directory))
+            if not root or os.path.commonpath([path, os.path.realpath(root)]) != os.path.realpath(root):
+                return jsonify({"error": "Directory imports are limited to BULK_IMPORT_ROOT."}), 400
+            if not os.path.isdir(path):
+                return jsonify({"error": "Directory not found."}), 404
+            report = import_resumes(iter_directory(path), applicant, processes)
+        else:
+            return jsonify({"error": "Send a ZIP file as 'archive' or a 'directory' name."}), 400
+    except (UploadRejected, zipfile.BadZipFile) as e:
+        return jsonify({"error": str(e)}), 400
+    except BulkImportAccountTaken as e:
+        return jsonify({"error": str(e)}), 409
+    return jsonify(report)
+
 # -------------------- APPLICANT PROFILE --------------------
 @app.route("/applicant/profile", methods=["GET", "POST"])
 def applicant_profile():
@@ -786,6 +2336,256 @@ def edit_profile():
         return redirect(url_for('applicant_dashboard'))
     return render_template('applicant_profile.html', applicant=applicant)
 
+# -------------------- CLI COMMANDS --------------------
+@app.cli.command("rebuild-tfidf-index")
+def rebuild_tfidf_index():
+    """Rebuild the corpus TF-IDF index from every resume and job description."""
+    documents = {}
+    for resume in Resume.query.all():
+        filepath = resolve_resume_filepath(resume)
+        if not filepath:
+            print(f"Skipping resume {resume.id}: file '{resume.filename}' not found.")
+            continue
+        resume_text = resume_text_cache.get_or_extract(filepath, extract_text_from_pdf)
+        documents[resume_index_key(resume.id)] = clean_text(resume_text)
+    for job in Job.query.all():
+        documents[job_index_key(job.id)] = clean_text(job.description or "")
+
+    tfidf_index.rebuild(documents)
+    print(f"TF-IDF index rebuilt: {len(tfidf_index)} documents, {len(tfidf_index.vocabulary)} terms.")
+    print("Run 'flask rebuild-score-matrix' to rescore candidate rankings against it.")
+
+@app.cli.command("rebuild-score-matrix")
+def rebuild_score_matrix():
+    """Recompute the resume x job score matrix for every approved job."""
+    job_ids = [job_id for job_id, in db.session.query(Job.id).filter(Job.status_key == "approved")]
+    score_matrix.rebuild(score_block(job_ids, indexed_resume_ids()) if job_ids else {})
+    cells = sum(len(ids) for ids, _ in score_matrix.columns.values())
+    print(f"Score matrix rebuilt: {len(job_ids)} approved job(s), {cells} non-zero scores.")
+
+@app.cli.command("rebuild-dashboard-rollups")
+def rebuild_dashboard_rollups_command():
+    """Recount the admin dashboard rollups from the base tables."""
+    counts = rebuild_dashboard_rollups()
+    db.session.commit()
+    print(f"Dashboard rollups rebuilt: {len(counts)} counter(s).")
+
+@app.cli.command("rebuild-job-skill-index")
+def rebuild_job_skill_index():
+    """Rebuild the skill -> job inverted index for every job."""
+    JobSkill.query.delete()
+    jobs = Job.query.all()
+    for job in jobs:
+        db.session.add_all(JobSkill(skill=skill, job_id=job.id) for skill in job_skills(job))
+    db.session.commit()
+    print(f"Job skill index rebuilt for {len(jobs)} job(s), {JobSkill.query.count()} rows.")
+
+@app.cli.command("import-resumes")
+@click.argument("source", type=click.Path(exists=True))
+@click.option("--applicant-id", type=int, default=None, help="Attach the resumes to this applicant (default: the bulk import profile).")
+@click.option("--processes", type=int, default=None, help="Size of the extraction process pool (default: all cores).")
+def import_resumes_command(source, applicant_id, processes):
+    """Import every resume PDF in a ZIP archive or directory tree."""
+    applicant = Applicant.query.get(applicant_id) if applicant_id else None
+    if applicant_id and not applicant:
+        raise click.BadParameter(f"No applicant with id {applicant_id}.", param_hint="--applicant-id")
+    try:
+        report = import_resumes(iter_source(source), applicant, processes)
+    except BulkImportAccountTaken as e:
+        raise click.ClickException(str(e))
+    for failure in report["failures"]:
+        print(f"FAILED {failure['file']}: {failure['error']}")
+    print(f"Imported {report['imported']} resume(s), {report['failed']} failed, "
+          f"in {report['seconds']:.1f}s ({report['files_per_second']} files/sec).")
+
+@app.cli.command("fold-resume-duplicates")
+@click.option("--dry-run", is_flag=True, help="Only report how much space folding would save.")
+def fold_resume_duplicates(dry_run):
+    """Move resume files into the blob store, keeping one copy of identical files, and remove orphaned blobs."""
+    resumes = Resume.query.filter(Resume.content_hash.is_(None)).order_by(Resume.id).all()
+    seen = set()
+    originals = set()  # Removed only at the end: several rows may point at the same file
+    folded = saved_bytes = 0
+    for resume in resumes:
+        filepath = resolve_resume_filepath(resume)
+        if not filepath:
+            print(f"Skipping resume {resume.id}: file '{resume.filename}' not found.")
+            continue
+        size = os.path.getsize(filepath)
+        content_hash = file_sha256(filepath)
+        if filepath not in originals and (content_hash in seen or blob_store.exists(content_hash)):
+            saved_bytes += size
+        seen.add(content_hash)
+        originals.add(filepath)
+        folded += 1
+        if dry_run:
+            continue
+
+        # Copy in and commit before any original is removed, so an interrupted run loses nothing
+        blob_store.put_file(filepath, content_hash=content_hash)
+        blob = db.session.get(ResumeBlob, content_hash, with_for_update=True)
+        if blob is None:
+            blob = ResumeBlob(content_hash=content_hash, size=size, ref_count=0)
+            db.session.add(blob)
+        blob.ref_count += 1
+        resume.content_hash = content_hash
+        db.session.commit()
+
+    if not dry_run:
+        for filepath in originals:
+            os.remove(filepath)
+    action = "Would fold" if dry_run else "Folded"
+    print(f"{action} {folded} resume file(s) into {len(seen)} blob(s), "
+          f"saving {saved_bytes / (1024 * 1024):.1f} MB.")
+
+    # Blobs stored for an upload or import whose transaction never committed
+    referenced = {content_hash for content_hash, in db.session.query(ResumeBlob.content_hash)}
+    cutoff = time.time() - app.config['BLOB_ORPHAN_GRACE_SECONDS']
+    orphans = orphan_bytes = 0
+    for content_hash, size, mtime in blob_store.iter_blobs():
+        if content_hash in referenced or mtime > cutoff:
+            continue
+        orphans += 1
+        orphan_bytes += size
+        if not dry_run:
+            purge_resume_blob(content_hash)  # Re-checks the row, in case it was committed meanwhile
+    action = "Would remove" if dry_run else "Removed"
+    print(f"{action} {orphans} orphaned blob(s), {orphan_bytes / (1024 * 1024):.1f} MB.")
+
+def hot_queries():
+    """The lookups behind login and the dashboards, with representative parameters."""
+    now = datetime.utcnow()
+    return {
+        "login": User.query.filter(User.username_lower == "someone"),
+        "approved jobs": Job.query.filter(Job.status_key == "approved"),
+        "admin jobs page": Job.query.filter(Job.status_key == "pending")
+            .filter(tuple_(Job.created_at, Job.id) < tuple_(now, 0))
+            .order_by(Job.created_at.desc(), Job.id.desc()).limit(21),
+        "admin rollups": DashboardRollup.query.filter(DashboardRollup.metric.in_([ROLLUP_RECORDS, ROLLUP_JOBS_BY_STATUS])),
+        "screenings per job page": DashboardRollup.query.filter(DashboardRollup.metric == ROLLUP_SCREENINGS_BY_JOB)
+            .order_by(DashboardRollup.value.desc(), DashboardRollup.bucket.desc()).limit(21),
+        "jobs page": Job.query
+            .filter(tuple_(Job.created_at, Job.id) < tuple_(now, 0))
+            .order_by(Job.created_at.desc(), Job.id.desc()).limit(21),
+        "screenings page": Screening.query
+            .filter(tuple_(Screening.screened_at, Screening.id) < tuple_(now, 0))
+            .order_by(Screening.screened_at.desc(), Screening.id.desc()).limit(21),
+        "screenings for job": Screening.query.filter(Screening.job_id == 1)
+            .order_by(Screening.match_score.desc()),
+        "screenings for resume": Screening.query.filter(Screening.resume_id == 1),
+        "screenings export for job": Screening.query.filter(Screening.job_id == 1, Screening.screened_at >= now)
+            .order_by(Screening.screened_at, Screening.id),
+        "screenings export": Screening.query.filter(Screening.screened_at >= now)
+            .order_by(Screening.screened_at, Screening.id),
+        "memoized screenings": Screening.query.filter(
+            Screening.job_description_hash == "0" * 64, Screening.scorer_version == SCORER_VERSION,
+            Screening.resume_hash.in_(["0" * 64])
+        ),
+        "screening by key": Screening.query.filter(Screening.screening_key == "0" * 64),
+        "stale screenings": Screening.query.filter(Screening.is_stale.is_(True))
+            .order_by(Screening.job_id.desc(), Screening.screened_at.desc(), Screening.id.desc()).limit(1000),
+        "resumes of applicant": Resume.query.filter(Resume.applicant_id == 1),
+        "applications of applicant": Application.query.filter(Application.applicant_id == 1),
+        "job skills of job": JobSkill.query.filter(JobSkill.job_id == 1),
+    }
+
+@app.cli.command("rescore-stale-screenings")
+@click.option("--job-id", type=int, default=None, help="Only rescore this job's screenings.")
+def rescore_stale_screenings_command(job_id):
+    """Rescore screenings left stale by job description edits."""
+    rescored = rescore_stale_screenings(job_id)
+    print(f"Rescored {rescored} stale screening(s).")
+
+@app.cli.command("check-query-plans")
+@click.option("--verbose", is_flag=True, help="Print the SQL and full plan of every query.")
+def check_query_plans(verbose):
+    """EXPLAIN the hot queries and exit non-zero if any of them scans a table or sorts without an index."""
+    results = check_queries(db.engine, hot_queries())
+    failed = 0
+    for name, (sql, lines, problems) in results.items():
+        print(f"{'FAIL' if problems else 'ok  '} {name}")
+        if verbose:
+            print(f"     {sql}")
+        for line in (lines if verbose else problems):
+            print(f"       {line}")
+        failed += bool(problems)
+    if failed:
+        print(f"{failed} of {len(results)} queries are not served by an index.")
+        raise SystemExit(1)
+    print(f"All {len(results)} queries use indexes.")
+
+@app.cli.command("screening-worker")
+@click.option("--processes", type=int, default=None, help="Size of the process pool (default: all cores).")
+@click.option("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+def screening_worker(processes, poll_interval):
+    """Consume the screening queue on a process pool and store results in the Screening table."""
+    processes = processes or os.cpu_count() or 1
+    stale_after = app.config['SCREENING_TASK_STALE_SECONDS']
+    requeued = screening_queue.requeue_abandoned(stale_after)
+    if requeued:
+        print(f"Re-queued {requeued} screening task(s) left running by a worker that is gone.")
+    preload_nlp_stack()  # Load once here; forked pool processes inherit it
+    print(f"Screening worker started with {processes} process(es).")
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        running = {}  # future -> (task, resume)
+        rescore_after = 0.0  # monotonic time before which stale rows are left alone
+        heartbeat_at = time.monotonic()
+        while True:
+            # Keep our running tasks from looking abandoned to a worker starting meanwhile
+            if running and time.monotonic() - heartbeat_at >= stale_after / 4:
+                screening_queue.heartbeat()
+                heartbeat_at = time.monotonic()
+
+            # Start every pass in a fresh transaction: a snapshot kept open from the last one
+            # (REPEATABLE READ) would hide resumes and stale screenings committed since
+            db.session.rollback()
+
+            # Keep every process busy
+            while len(running) < processes:
+                task = screening_queue.claim()
+                if task is None:
+                    break
+                resume = Resume.query.get(task["resume_id"])
+                filepath = resolve_resume_filepath(resume) if resume else None
+                if not filepath:
+                    screening_queue.fail(task["id"], "Resume file not found.")
+                    continue
+                resume_hash = resume_content_hash(resume, filepath)
+                memo_key = screening_memo_key(resume_hash, task["job_description"])
+                memoized = screening_memo.get(memo_key)
+                if memoized is not None:
+                    # Screened before: store the result without using a pool process
+                    store_screening_result(task, resume, resume_hash, memoized)
+                    continue
+                future = pool.submit(screen_resume_task, filepath, resume.id, task["job_id"], task["job_description"])
+                running[future] = (task, resume, resume_hash, memo_key)
+
+            if not running:
+                # Idle: work through screenings left stale by job edits, else wait
+                rescored = 0
+                if time.monotonic() >= rescore_after:
+                    try:
+                        rescored = rescore_stale_screenings(limit=app.config['RESCORE_BATCH_SIZE'])
+                    except Exception as e:
+                        rescore_after = time.monotonic() + app.config['RESCORE_RETRY_SECONDS']
+                        print(f"Rescoring stale screenings failed, retrying in {app.config['RESCORE_RETRY_SECONDS']}s: {e}")
+                if not rescored:
+                    time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, resume, resume_hash, memo_key = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    screening_queue.fail(task["id"], e)
+                    print(f"Screening task {task['id']} failed: {e}")
+                    continue
+                screening_memo.put(memo_key, {"matched_skills": result["matched_skills"], "match_score": result["match_score"]})
+                store_screening_result(task, resume, resume_hash, result)
+
 # -------------------- RUN APP --------------------
 if __name__ == "__main__":
     with app.app_context():
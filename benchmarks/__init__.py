@@ -0,0 +1 @@
+# benchmarks - Performance measurements for SmartHire (run each module with python -m)
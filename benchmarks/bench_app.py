@@ -0,0 +1,213 @@
+# bench_app.py - End-to-end benchmark on a synthetic corpus: pipeline stages, screening and dashboards
+#
+# Builds a seeded corpus (benchmarks/corpus.py), loads it into a throwaway SQLite-backed
+# instance of the app through the real routes, then reports latency percentiles,
+# throughput, SQL statements per request and peak RSS as JSON. Run it on two commits
+# and diff the outputs.
+#
+# Usage: python -m benchmarks.bench_app [--resumes 200] [--jobs 20] [--seed 42] [--repeat 20] [--output bench.json]
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SQL = {"statements": 0}
+
+
+def percentiles(seconds):
+    """Latency summary in milliseconds (nearest-rank percentiles)."""
+    if not seconds:
+        return {"count": 0}
+    ordered = sorted(seconds)
+
+    def rank(p):
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 3)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": rank(50),
+        "p90_ms": rank(90),
+        "p99_ms": rank(99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def measure(fn, items):
+    """Call fn(item) for each item; latency percentiles, throughput, SQL statements and HTTP statuses."""
+    samples, statements, statuses = [], [], Counter()
+    started = time.perf_counter()
+    for item in items:
+        before = SQL["statements"]
+        t = time.perf_counter()
+        result = fn(item)
+        samples.append(time.perf_counter() - t)
+        statements.append(SQL["statements"] - before)
+        if hasattr(result, "status_code"):
+            statuses[str(result.status_code)] += 1
+    elapsed = time.perf_counter() - started
+    report = percentiles(samples)
+    report["per_second"] = round(len(samples) / elapsed, 2) if elapsed > 0 else None
+    if statements:
+        report["sql_statements_per_call"] = {"mean": round(sum(statements) / len(statements), 2), "max": max(statements)}
+    if statuses:
+        report["http_status"] = dict(statuses)
+    return report
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def login(client, username):
+    client.post("/logout")
+    client.post("/login", data={"username": username, "password": "bench"})
+
+
+def run(args, workdir):
+    # The app reads these at import time, so set them before importing it
+    os.environ["SMARTHIRE_DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["SMARTHIRE_INSTANCE_PATH"] = os.path.join(workdir, "instance")
+    os.environ.setdefault("SMARTHIRE_PROFILING", "0")
+    sys.path.insert(0, PROJECT_DIR)
+
+    from benchmarks.corpus import generate_corpus
+    started = time.perf_counter()
+    corpus = generate_corpus(os.path.join(workdir, "corpus"), args.resumes, args.jobs, args.seed)
+    corpus_seconds = time.perf_counter() - started
+
+    import app as smarthire
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def count_statement(*_):
+        SQL["statements"] += 1
+
+    flask_app, db = smarthire.app, smarthire.db
+    rng = random.Random(args.seed)
+    report = {
+        "params": {"resumes": args.resumes, "jobs": args.jobs, "seed": args.seed, "repeat": args.repeat},
+        "environment": {"git_commit": git_commit(), "python": platform.python_version()},
+        "corpus": {"generate_seconds": round(corpus_seconds, 3)},
+    }
+
+    with flask_app.app_context():
+        db.create_all()
+        employer_user = smarthire.User(username="bench_employer", password="bench", role="employer")
+        applicant_user = smarthire.User(username="bench_applicant", password="bench", role="applicant")
+        db.session.add_all([employer_user, applicant_user,
+                            smarthire.User(username="bench_admin", password="bench", role="admin")])
+        db.session.flush()
+        db.session.add_all([
+            smarthire.Employer(user_id=employer_user.id, fullname="Bench Employer", email="employer@example.com"),
+            smarthire.Applicant(user_id=applicant_user.id, fullname="Bench Applicant", email="applicant@example.com"),
+        ])
+        db.session.commit()
+
+    client = flask_app.test_client()
+
+    # --- Loading the corpus through the routes ---
+    login(client, "bench_applicant")
+
+    def upload(path):
+        with open(path, "rb") as f:
+            return client.post("/upload_resume", data={"resume": (f, os.path.basename(path))},
+                               content_type="multipart/form-data")
+    report["load"] = {"upload_resume": measure(upload, corpus["resumes"])}
+
+    login(client, "bench_employer")
+    report["load"]["submit_job"] = measure(lambda job: client.post("/jobs/submit", data=job), corpus["jobs"])
+    with flask_app.app_context():
+        job_ids = [job_id for job_id, in db.session.query(smarthire.Job.id).order_by(smarthire.Job.id)]
+        resume_ids = [resume_id for resume_id, in db.session.query(smarthire.Resume.id).order_by(smarthire.Resume.id)]
+    login(client, "bench_admin")
+    report["load"]["approve_job"] = measure(lambda job_id: client.post(f"/jobs/approve/{job_id}"), job_ids)
+
+    # --- Pipeline stages, called directly ---
+    with flask_app.app_context():
+        texts = [smarthire.extract_text_from_pdf(path) for path in corpus["resumes"][:args.repeat]]
+        pairs = [(rng.randrange(len(resume_ids)), rng.randrange(len(job_ids))) for _ in range(args.repeat)]
+        report["stages"] = {
+            "extract_text_from_pdf": measure(smarthire.extract_text_from_pdf, corpus["resumes"][:args.repeat]),
+            "calculate_ai_match_score": measure(lambda pair: smarthire.calculate_ai_match_score(
+                texts[pair[0] % len(texts)], corpus["jobs"][pair[1]]["description"],
+                smarthire.resume_index_key(resume_ids[pair[0]]), smarthire.job_index_key(job_ids[pair[1]])
+            ), pairs),
+            # First pass over these texts, so the entity cache is cold
+            "extract_professions": measure(smarthire.extract_professions, texts),
+        }
+
+    # --- Screening ---
+    login(client, "bench_employer")
+    screen = lambda pair: client.post("/upload_screening", data={  # noqa: E731
+        "resume_id": str(resume_ids[pair[0]]), "job_id": str(job_ids[pair[1]])
+    })
+    report["screening"] = {
+        "upload_screening": measure(screen, pairs),
+        "upload_screening_repeat": measure(screen, pairs),  # Same pairs again: memo hits
+        "upload_screening_batch": measure(
+            lambda job_id: client.post("/upload_screening/batch", data={"job_id": str(job_id)}), job_ids[:3]
+        ),
+        "top_candidates": measure(lambda job_id: client.get(f"/jobs/{job_id}/top_candidates"), job_ids),
+    }
+    batch = report["screening"]["upload_screening_batch"]
+    if batch.get("mean_ms"):
+        batch["resumes_per_second"] = round(len(resume_ids) / (batch["mean_ms"] / 1000), 2)
+
+    # --- Dashboards ---
+    runs = range(args.repeat)
+    report["dashboards"] = {
+        "employer_dashboard": measure(lambda _: client.get("/dashboard/employer"), runs),
+        "employer_dashboard_jobs": measure(lambda _: client.get("/dashboard/employer/jobs"), runs),
+        "employer_dashboard_resumes": measure(lambda _: client.get("/dashboard/employer/resumes"), runs),
+        "employer_dashboard_screenings": measure(lambda _: client.get("/dashboard/employer/screenings"), runs),
+    }
+    login(client, "bench_applicant")
+    report["dashboards"]["applicant_dashboard"] = measure(lambda _: client.get("/dashboard/applicant"), runs)
+    login(client, "bench_admin")
+    report["dashboards"]["admin_dashboard"] = measure(lambda _: client.get("/dashboard/admin"), runs)
+
+    report["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screening and dashboards on a synthetic corpus.")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per stage, screening and dashboard.")
+    parser.add_argument("--workdir", help="Keep the corpus, database and instance folder here (default: a temp dir).")
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    args = parser.parse_args()
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        report = run(args, os.path.abspath(args.workdir))
+    else:
+        with tempfile.TemporaryDirectory(prefix="smarthire-bench-") as workdir:
+            report = run(args, workdir)
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
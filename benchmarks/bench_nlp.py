@@ -0,0 +1,80 @@
+# bench_nlp.py - Entity extraction throughput: full spaCy pipeline vs trimmed, batched and cached
+#
+# Usage: python -m benchmarks.bench_nlp [--docs 200] [--batch-size 32] [--n-process 1] [--output nlp.json]
+
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDF_GLOBS = ["static/uploads/*.pdf", "static/screenings/*.pdf", "instance/blobs/*/*/*.pdf"]
+
+
+def load_texts(count):
+    """count lowercased resume texts, cycling through the PDFs in the project (made unique so caches miss)."""
+    from app import extract_text_from_pdf
+    paths = sorted({p for pattern in PDF_GLOBS for p in glob.glob(os.path.join(PROJECT_DIR, pattern))})
+    texts = [t for t in (extract_text_from_pdf(p) for p in paths) if t.strip()]
+    if not texts:
+        raise SystemExit("No resume PDFs with text found under static/ or instance/blobs/.")
+    return [f"{texts[i % len(texts)].lower()}\ncandidate {i}" for i in range(count)]
+
+
+def timed(label, fn, docs):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return label, {"seconds": round(elapsed, 4), "docs_per_second": round(docs / elapsed, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure spaCy entity extraction throughput.")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    args = parser.parse_args()
+
+    import spacy
+    from nlp_service import ENTITY_LABELS, NlpService
+
+    texts = load_texts(args.docs)
+    full = spacy.load(args.model)
+    trimmed = NlpService(args.model, batch_size=args.batch_size, n_process=args.n_process)
+    trimmed.nlp  # Load outside the timed sections
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cached = NlpService(args.model, cache_dir=cache_dir, batch_size=args.batch_size)
+        cached._nlp = trimmed.nlp
+        cached.entities_many(texts)  # Fill the cache
+
+        results = dict([
+            timed("full_pipeline_per_doc", lambda: [
+                [ent for ent in full(text).ents if ent.label_ in ENTITY_LABELS] for text in texts
+            ], len(texts)),
+            timed("trimmed_pipe", lambda: trimmed.entities_many(texts), len(texts)),
+            timed("cached", lambda: cached.entities_many(texts), len(texts)),
+        ])
+
+    report = {
+        "docs": len(texts),
+        "model": args.model,
+        "batch_size": args.batch_size,
+        "n_process": args.n_process,
+        "full_pipeline_components": full.pipe_names,
+        "trimmed_pipeline_components": trimmed.nlp.pipe_names,
+        **results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
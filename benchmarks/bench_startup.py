@@ -0,0 +1,69 @@
+# bench_startup.py - How long it takes to import the app, and what the NLP stack costs
+#
+# Usage: python -m benchmarks.bench_startup [--runs 5] [--output startup.json]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each probe runs in a fresh interpreter and prints one JSON line
+IMPORT_PROBE = """
+import json, resource, time
+t = time.perf_counter()
+import app
+elapsed = time.perf_counter() - t
+print(json.dumps({"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+PRELOAD_PROBE = """
+import json, resource, time
+import app
+t = time.perf_counter()
+app.preload_nlp_stack()
+elapsed = time.perf_counter() - t
+print(json.dumps({"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def run_probe(code, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    seconds = [s["seconds"] for s in samples]
+    return {
+        "runs": runs,
+        "median_seconds": round(statistics.median(seconds), 4),
+        "min_seconds": round(min(seconds), 4),
+        "max_rss_kb": max(s["max_rss_kb"] for s in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app import time and NLP preload cost.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-preload", action="store_true", help="Only time 'import app'.")
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    args = parser.parse_args()
+
+    report = {"import_app": run_probe(IMPORT_PROBE, args.runs)}
+    if not args.skip_preload:
+        report["preload_nlp_stack"] = run_probe(PRELOAD_PROBE, args.runs)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# corpus.py - Seeded synthetic resume PDFs and job postings for the benchmarks (no network, no extra packages)
+#
+# Usage: python -m benchmarks.corpus OUT_DIR [--resumes 200] [--jobs 20] [--seed 42]
+
+import argparse
+import glob
+import json
+import os
+import random
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_PDF_DIR = os.path.join(PROJECT_DIR, "static", "screenings")
+TAXONOMY_PATH = os.path.join(PROJECT_DIR, "data", "skill_taxonomy.json")
+
+FIRST_NAMES = ["Ana", "Ben", "Carlo", "Dana", "Eli", "Faye", "Gabe", "Hana", "Ivan", "Joy", "Karl", "Lea",
+               "Marco", "Nina", "Oscar", "Pia", "Quin", "Rosa", "Sam", "Tess", "Uri", "Vina", "Wes", "Yael"]
+LAST_NAMES = ["Reyes", "Santos", "Cruz", "Garcia", "Mendoza", "Torres", "Flores", "Ramos", "Aquino",
+              "Bautista", "Castro", "Dela Cruz", "Navarro", "Villanueva", "Lim", "Tan"]
+COMPANIES = ["Acme Corp", "Northwind", "Globex", "Initech", "Umbrella Labs", "Vandelay", "Hooli", "Stark Digital"]
+LINES_PER_PAGE = 50
+
+
+def seed_lines(directory=SEED_PDF_DIR):
+    """Non-empty text lines of the real resumes in static/screenings, used as filler."""
+    from PyPDF2 import PdfReader
+    lines = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+        try:
+            text = "".join(page.extract_text() or "" for page in PdfReader(path).pages)
+        except Exception:
+            continue
+        lines.extend(line.strip() for line in text.splitlines() if len(line.strip()) > 3)
+    return lines or ["Responsible for day to day operations and reporting."]
+
+
+def load_taxonomy(path=TAXONOMY_PATH):
+    with open(path, encoding="utf-8") as f:
+        categories = json.load(f)["categories"]
+    return {category: sorted(terms.items()) for category, terms in categories.items()}
+
+
+def _pdf_string(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_pdf(path, lines):
+    """Write lines of text as a plain Helvetica PDF (one page per LINES_PER_PAGE lines)."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for n, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * n, 5 + 2 * n
+        stream = "BT /F1 10 Tf 14 TL 50 750 Td " + " ".join(f"{_pdf_string(line)} Tj T*" for line in page_lines) + " ET"
+        data = stream.encode("latin-1")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(data)} >>\nstream\n{stream}\nendstream"
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def resume_lines(rng, taxonomy, filler, name):
+    skills = rng.sample(taxonomy["skill"], k=min(len(taxonomy["skill"]), rng.randint(3, 10)))
+    professions = rng.sample(taxonomy["profession"], k=min(len(taxonomy["profession"]), rng.randint(1, 3)))
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +63 9{rng.randint(10, 99)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "",
+        "PROFILE",
+        f"{rng.choice(professions)[0].title()} with {rng.randint(1, 15)} years of experience.",
+        "",
+        "SKILLS",
+        ", ".join(rng.choice(synonyms) for _, synonyms in skills),
+        "",
+        "EXPERIENCE",
+    ]
+    for canonical, _ in professions:
+        lines.append(f"{canonical.title()} - {rng.choice(COMPANIES)} ({rng.randint(2010, 2025)})")
+        lines.extend(rng.sample(filler, k=min(len(filler), rng.randint(3, 8))))
+    lines += ["", "EDUCATION", rng.choice(filler)]
+    return lines
+
+
+def job_posting(rng, taxonomy, filler):
+    profession = rng.choice(taxonomy["profession"])[0]
+    skills = [canonical for canonical, _ in rng.sample(taxonomy["skill"], k=min(len(taxonomy["skill"]), rng.randint(3, 8)))]
+    description = (
+        f"We are hiring a {profession} to join our team. Required skills: {', '.join(skills)}. "
+        + " ".join(rng.sample(filler, k=min(len(filler), rng.randint(2, 6))))
+    )
+    return {"title": profession.title(), "company": rng.choice(COMPANIES), "description": description}
+
+
+def generate_corpus(out_dir, resumes=200, jobs=20, seed=42):
+    """
+    Write `resumes` synthetic resume PDFs into out_dir and return
+    {"resumes": [pdf paths], "jobs": [{"title", "company", "description"}]}.
+    The same seed always produces the same corpus.
+    """
+    rng = random.Random(seed)
+    taxonomy = load_taxonomy()
+    filler = seed_lines()
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for n in range(resumes):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        path = os.path.join(out_dir, f"resume_{n:05d}_{name.replace(' ', '_')}.pdf")
+        write_pdf(path, resume_lines(rng, taxonomy, filler, name))
+        paths.append(path)
+    return {"resumes": paths, "jobs": [job_posting(rng, taxonomy, filler) for _ in range(jobs)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume/job corpus.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    corpus = generate_corpus(args.out_dir, args.resumes, args.jobs, args.seed)
+    with open(os.path.join(args.out_dir, "jobs.json"), "w") as f:
+        json.dump(corpus["jobs"], f, indent=2)
+    print(f"Wrote {len(corpus['resumes'])} resume PDFs and {len(corpus['jobs'])} jobs to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
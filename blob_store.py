@@ -0,0 +1,88 @@
+# blob_store.py - Content-addressed storage for resume PDFs
+
+import os
+import shutil
+
+from text_cache import file_sha256
+
+
+class BlobStore:
+    """
+    Stores each distinct file once, named by the SHA-256 of its bytes and
+    sharded two levels deep (ab/cd/abcd....pdf) so no directory grows huge.
+    Which rows use a blob (and when it may be deleted) is tracked by the
+    caller; this class only knows about files.
+    """
+
+    def __init__(self, root, suffix=".pdf"):
+        self.root = root
+        self.suffix = suffix
+        self.tmp_dir = os.path.join(root, "tmp")  # Same filesystem, so moves in are atomic renames
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, content_hash):
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash + self.suffix)
+
+    def exists(self, content_hash):
+        return os.path.exists(self.path(content_hash))
+
+    def put_upload(self, upload):
+        """
+        Store a finished SpooledUpload (see upload_stream.py) and return its
+        hash. If the same bytes are already stored the upload is discarded.
+        """
+        upload.check()
+        content_hash = upload.sha256
+        path = self.path(content_hash)
+        if os.path.exists(path):
+            upload.close()
+            os.utime(path)  # Freshly used: keeps an orphan sweep (see iter_blobs) off it
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            upload.commit(path)
+        return content_hash
+
+    def put_file(self, filepath, move=False, content_hash=None):
+        """Store a file that is already on disk (copied, or moved with move=True) and return its hash."""
+        content_hash = content_hash or file_sha256(filepath)
+        path = self.path(content_hash)
+        if os.path.exists(path):
+            if move:
+                os.remove(filepath)
+            os.utime(path)
+            return content_hash
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = os.path.join(self.tmp_dir, f"{content_hash}.{os.getpid()}.tmp")
+        if move:
+            shutil.move(filepath, tmp_path)
+        else:
+            shutil.copyfile(filepath, tmp_path)
+        os.replace(tmp_path, path)
+        return content_hash
+
+    def iter_blobs(self):
+        """Yield (content hash, size, mtime) for every stored blob (temporary files excluded)."""
+        for first in sorted(os.listdir(self.root)):
+            first_dir = os.path.join(self.root, first)
+            if len(first) != 2 or not os.path.isdir(first_dir):
+                continue  # tmp/ and anything else that is not a shard
+            for second in sorted(os.listdir(first_dir)):
+                second_dir = os.path.join(first_dir, second)
+                if not os.path.isdir(second_dir):
+                    continue
+                for name in sorted(os.listdir(second_dir)):
+                    if not name.endswith(self.suffix):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(second_dir, name))
+                    except FileNotFoundError:
+                        continue  # Deleted meanwhile
+                    yield name[:-len(self.suffix)], stat.st_size, stat.st_mtime
+
+    def delete(self, content_hash):
+        """Remove a blob; returns False if it was not there."""
+        try:
+            os.remove(self.path(content_hash))
+        except FileNotFoundError:
+            return False
+        return True
@@ -0,0 +1,49 @@
+# bulk_import.py - Read resume PDFs out of a ZIP archive or a directory tree, one at a time
+
+import os
+import zipfile
+
+
+def is_resume_name(name):
+    """PDF files only, skipping hidden files and macOS archive metadata."""
+    parts = name.replace("\\", "/").split("/")
+    return parts[-1].lower().endswith(".pdf") and not parts[-1].startswith(".") and "__MACOSX" not in parts
+
+
+def iter_zip(fileobj):
+    """
+    Yield (member name, readable stream) for every PDF in a ZIP archive.
+    Members are decompressed as they are read; nothing is extracted to disk.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not is_resume_name(info.filename):
+                continue
+            with archive.open(info) as member:
+                yield info.filename, member
+
+
+def iter_directory(path):
+    """Yield (path relative to the directory, open file) for every PDF below path, in a stable order."""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if not is_resume_name(name):
+                continue
+            filepath = os.path.join(root, name)
+            with open(filepath, "rb") as f:
+                yield os.path.relpath(filepath, path), f
+
+
+def iter_source(path):
+    """iter_directory for a directory, iter_zip for a .zip file."""
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if zipfile.is_zipfile(path):
+        return _iter_zip_file(path)
+    raise ValueError(f"'{path}' is neither a directory nor a ZIP archive.")
+
+
+def _iter_zip_file(path):
+    with open(path, "rb") as f:
+        yield from iter_zip(f)
@@ -1,51 +1,204 @@
-# db_connector.py - Save this file in the 'myproject' directory
+# db_connector.py - Pooled raw-SQL access to the smartHire database
 
-import mysql.connector
-from mysql.connector import Error
+import os
+import threading
+import time
+from contextlib import contextmanager
 
-# --- Configuration for XAMPP MySQL ---
-HOST = "localhost"
-USER = "root"
-PASSWORD = ""  # The default password in XAMPP is usually empty
-DATABASE = "smartHire" # Confirmed from your previous phpMyAdmin image
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import SQLAlchemyError
 
+# --- Configuration for XAMPP MySQL (override with SMARTHIRE_DATABASE_URL, e.g. sqlite:///test.db) ---
+DATABASE_URL = os.environ.get("SMARTHIRE_DATABASE_URL", "mysql+pymysql://root:@localhost/smartHire")
+
+# Pool settings, also used for the Flask-SQLAlchemy engine in app.py
+POOL_OPTIONS = {
+    "pool_size": 5,         # Connections kept open
+    "max_overflow": 10,     # Extra connections allowed under load (closed when returned)
+    "pool_timeout": 30,     # Seconds to wait for a free connection before failing
+    "pool_recycle": 1800,   # Reconnect before MySQL's wait_timeout drops idle connections
+    "pool_pre_ping": True,  # Test each connection on checkout and replace dead ones
+}
+
+
+class DatabaseError(Exception):
+    """A query failed or no connection could be obtained."""
+
+
+_engine = None
+_engine_lock = threading.RLock()
+_metrics_lock = threading.Lock()
+_metrics = {}
+
+
+def _reset_metrics():
+    _metrics.update(checked_out=0, checkouts=0, wait_seconds=0.0, max_wait_seconds=0.0)
+
+
+_reset_metrics()
+
+
+def engine_options(url):
+    """POOL_OPTIONS, minus the ones an in-memory SQLite database (a single shared connection) does not accept."""
+    if url.startswith("sqlite") and (url.endswith("://") or ":memory:" in url):
+        return {"pool_pre_ping": POOL_OPTIONS["pool_pre_ping"]}
+    return dict(POOL_OPTIONS)
+
+
+def configure(url=None, **options):
+    """
+    (Re)create the pool, e.g. to point at a local SQLite file in tests.
+    Extra keyword arguments override POOL_OPTIONS.
+    """
+    global _engine
+    url = url or DATABASE_URL
+    engine = create_engine(url, **{**engine_options(url), **options})
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+    with _engine_lock:
+        old, _engine = _engine, engine
+    if old is not None:
+        old.dispose()
+    with _metrics_lock:
+        _reset_metrics()
+    return engine
+
+
+def get_engine():
+    """The shared engine, created on first use."""
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                configure()
+    return _engine
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _metrics_lock:
+        _metrics["checked_out"] += 1
+        _metrics["checkouts"] += 1
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    with _metrics_lock:
+        _metrics["checked_out"] = max(0, _metrics["checked_out"] - 1)
+
+
+@contextmanager
 def get_db_connection():
     """
-    Attempts to establish and return a new connection object to the 'smartHire' database.
-    Always returns a new connection object if successful, or None if it fails.
+    Borrow a pooled connection for the duration of a with-block and return it
+    to the pool afterwards. Raises DatabaseError if none can be obtained.
     """
+    engine = get_engine()
+    started = time.perf_counter()
     try:
-        conn = mysql.connector.connect(
-            host=HOST,
-            user=USER,
-            password=PASSWORD,
-            database=DATABASE
-        )
-        return conn
-    except Error as e:
-        # Print a clear error message if the connection fails
+        conn = engine.connect()
+    except SQLAlchemyError as e:
         print("----------------------------------------------------------------------")
         print("!!! Database Connection Error. Ensure XAMPP MySQL is RUNNING and")
-        print(f"!!! the database '{DATABASE}' exists. Error details: {e}")
+        print(f"!!! the database at '{engine.url.render_as_string()}' exists. Error details: {e}")
         print("----------------------------------------------------------------------")
-        return None
+        raise DatabaseError(f"Could not connect to the database: {e}") from e
+    waited = time.perf_counter() - started
+    with _metrics_lock:
+        _metrics["wait_seconds"] += waited
+        _metrics["max_wait_seconds"] = max(_metrics["max_wait_seconds"], waited)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _execute(conn, sql_query, params):
+    # A dict binds :name placeholders; a tuple/list is passed to the driver as-is
+    # (%s for MySQL, ? for SQLite), which is what the old mysql.connector callers used
+    if isinstance(params, dict):
+        return conn.execute(text(sql_query), params)
+    return conn.exec_driver_sql(sql_query, tuple(params or ()))
+
 
-# Simple function to get data, using dictionary cursors for easy column access
 def fetch_data(sql_query, params=None):
     """Executes a SELECT query and returns the results as a list of dictionaries."""
-    conn = get_db_connection()
-    results = []
-
-    if conn is not None:
-        # Use dictionary=True so results are returned as dictionaries instead of tuples
-        cursor = conn.cursor(dictionary=True) 
-        try:
-            cursor.execute(sql_query, params or ())
-            results = cursor.fetchall()
-        except Exception as e:
-            print(f"Database Query Error: {e}")
-        finally:
-            cursor.close()
-            conn.close()
-    
-    return results
\ No newline at end of file
+    try:
+        with get_db_connection() as conn:
+            return [dict(row) for row in _execute(conn, sql_query, params).mappings()]
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Database Query Error: {e}") from e
+
+
+def fetch_one(sql_query, params=None):
+    """Like fetch_data, but returns only the first row (or None)."""
+    try:
+        with get_db_connection() as conn:
+            row = _execute(conn, sql_query, params).mappings().first()
+            return dict(row) if row is not None else None
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Database Query Error: {e}") from e
+
+
+def stream_data(sql_query, params=None, batch_size=1000):
+    """
+    Yield the rows of a large SELECT as dictionaries without loading them all.
+    Uses a server-side cursor where the driver has one (PyMySQL's SSCursor), so
+    memory stays at about batch_size rows. The connection is held until the
+    generator is exhausted or closed.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=batch_size)
+            result = _execute(conn, sql_query, params)
+            for rows in result.mappings().partitions(batch_size):
+                for row in rows:
+                    yield dict(row)
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Database Query Error: {e}") from e
+
+
+def execute(sql_query, params=None):
+    """Run one INSERT/UPDATE/DELETE in its own transaction and return the affected row count."""
+    try:
+        with get_db_connection() as conn, conn.begin():
+            return _execute(conn, sql_query, params).rowcount
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Database Query Error: {e}") from e
+
+
+def execute_many(sql_query, rows, batch_size=1000):
+    """
+    Run one write statement for many parameter sets (dicts for :name, tuples for
+    driver placeholders) using the driver's executemany, batch_size rows per
+    round trip, all in a single transaction. Returns the number of rows sent.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    named = isinstance(rows[0], dict)
+    try:
+        with get_db_connection() as conn, conn.begin():
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                if named:
+                    conn.execute(text(sql_query), batch)
+                else:
+                    conn.exec_driver_sql(sql_query, [tuple(row) for row in batch])
+        return len(rows)
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"Database Query Error: {e}") from e
+
+
+def pool_metrics():
+    """
+    Snapshot of the pool: connections checked out right now, total checkouts,
+    and how long callers waited for a connection (total/average/max seconds).
+    """
+    engine = get_engine()
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics["avg_wait_seconds"] = metrics["wait_seconds"] / metrics["checkouts"] if metrics["checkouts"] else 0.0
+    metrics["pool_status"] = engine.pool.status()
+    for name in ("size", "overflow", "checkedin"):
+        method = getattr(engine.pool, name, None)
+        if callable(method):
+            metrics[name] = method()
+    return metrics
@@ -0,0 +1,74 @@
+# export_stream.py - Streamed CSV/NDJSON exports read through a server-side cursor
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+# Export format -> response mimetype
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Spreadsheet apps run cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def stream_rows(engine, statement, batch_size=1000):
+    """
+    Yield the rows of a SELECT as dicts, batch_size at a time, through a
+    server-side cursor where the driver has one (PyMySQL's SSCursor), so memory
+    stays at about one batch whatever the size of the result. The connection is
+    held until the generator is exhausted or closed.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(statement)
+        for rows in result.mappings().partitions(batch_size):
+            for row in rows:
+                yield dict(row)
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def csv_chunks(rows, columns, rows_per_chunk=500):
+    """CSV text (header first) in chunks of rows_per_chunk rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for n, row in enumerate(rows, 1):
+        writer.writerow([_csv_cell(row[column]) for column in columns])
+        if n % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(rows, columns, rows_per_chunk=500):
+    """One JSON object per line, in chunks of rows_per_chunk rows."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: row[column] for column in columns}, default=_json_default))
+        if len(lines) == rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+ENCODERS = {"csv": csv_chunks, "ndjson": ndjson_chunks}
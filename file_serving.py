@@ -0,0 +1,82 @@
+# file_serving.py - File downloads with content-hash ETags, ranges, immutable caching and proxy offload
+
+import os
+from urllib.parse import quote
+
+from flask import current_app, request
+from werkzeug.utils import send_file
+
+OFFLOAD_MODES = ("x-sendfile", "x-accel-redirect")
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def init_file_serving(app, locations=None):
+    """
+    Configure send_stored_file.
+
+    FILE_OFFLOAD (env SMARTHIRE_FILE_OFFLOAD) hands file transfers to the front
+    proxy: "x-sendfile" (Apache mod_xsendfile, lighttpd) sends the file's path,
+    "x-accel-redirect" (nginx) an internal URI built from FILE_OFFLOAD_LOCATIONS,
+    {directory on disk: internal location prefix}, e.g.
+
+        location /_protected/blobs/ { internal; alias /srv/smarthire/instance/blobs/; }
+
+    Unset, the worker sends files itself.
+    """
+    app.config.setdefault('FILE_OFFLOAD', os.environ.get("SMARTHIRE_FILE_OFFLOAD") or None)
+    app.config.setdefault('FILE_OFFLOAD_LOCATIONS', dict(locations or {}))
+    app.config.setdefault('FILE_IMMUTABLE_MAX_AGE', IMMUTABLE_MAX_AGE)
+    if app.config['FILE_OFFLOAD'] not in (None,) + OFFLOAD_MODES:
+        raise ValueError(f"FILE_OFFLOAD must be one of {OFFLOAD_MODES} or unset, not {app.config['FILE_OFFLOAD']!r}")
+
+
+def accel_redirect_uri(path, locations):
+    """Internal nginx URI for path, or None when it is under none of the locations."""
+    real = os.path.realpath(path)
+    for directory, prefix in locations.items():
+        root = os.path.realpath(directory)
+        if real.startswith(root + os.sep):
+            return prefix.rstrip("/") + "/" + quote(os.path.relpath(real, root).replace(os.sep, "/"))
+    return None
+
+
+def send_stored_file(path, download_name, as_attachment=False, etag=None, immutable=False):
+    """
+    Send a file from disk (FileNotFoundError if it is missing).
+
+    etag (e.g. the file's content hash) replaces Werkzeug's mtime/size tag, so
+    If-None-Match gets a 304 for as long as the bytes are the same. With
+    immutable=True browsers may keep the file for FILE_IMMUTABLE_MAX_AGE without
+    asking again; it is marked private either way, as resumes are personal data.
+
+    Without offload the worker answers Range requests and streams the body
+    through wsgi.file_wrapper (sendfile(2) under gunicorn). With offload it
+    returns headers only and the proxy sends the bytes, ranges included; a
+    path outside every FILE_OFFLOAD_LOCATIONS entry is sent by the worker.
+    """
+    config = current_app.config
+    offload = config['FILE_OFFLOAD']
+    accel_uri = None
+    if offload == "x-accel-redirect":
+        accel_uri = accel_redirect_uri(path, config['FILE_OFFLOAD_LOCATIONS'])
+    offloaded = offload == "x-sendfile" or accel_uri is not None
+
+    response = send_file(
+        path, request.environ, download_name=download_name, as_attachment=as_attachment,
+        etag=etag or True, max_age=config['FILE_IMMUTABLE_MAX_AGE'] if immutable else None,
+        use_x_sendfile=offloaded, conditional=not offloaded, response_class=current_app.response_class
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    if immutable:
+        response.cache_control.immutable = True
+
+    if offloaded:
+        # 304s are still answered here; Range is left to the proxy, which has the file
+        response = response.make_conditional(request.environ)
+        if response.status_code == 304:
+            response.headers.pop("X-Sendfile", None)
+        elif accel_uri is not None:
+            del response.headers["X-Sendfile"]
+            response.headers["X-Accel-Redirect"] = accel_uri
+    return response
@@ -0,0 +1,22 @@
+# gunicorn.conf.py - Production server settings (run with: gunicorn app:app)
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", (os.cpu_count() or 1) * 2 + 1))
+
+# Import the app once in the master. With SMARTHIRE_PRELOAD_NLP=1 the spaCy model,
+# scikit-learn and the TF-IDF index are loaded there too, and every forked worker
+# shares those pages copy-on-write instead of loading its own copy.
+preload_app = True
+PRELOAD_NLP = os.environ.get("SMARTHIRE_PRELOAD_NLP", "0") == "1"
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported and before workers are forked
+    import app
+    # Metrics files left by a previous run's workers would be added to this run's totals
+    app.metrics_registry.clear_directory()
+    if PRELOAD_NLP:
+        app.preload_nlp_stack()
+        server.log.info("NLP stack preloaded in master for copy-on-write sharing")
@@ -0,0 +1,326 @@
+# metrics.py - Prometheus-format metrics aggregated across processes, without extra packages
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Response, g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, help, labels=(), fn=None):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.fn = fn  # Read at flush time instead of being updated by the code
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def collect(self, *args):
+        """{label values: value} from fn (a plain value means no labels)."""
+        values = self.fn(*args)
+        if not isinstance(values, dict):
+            values = {(): values}
+        return {tuple(str(v) for v in (key if isinstance(key, tuple) else (key,))): value
+                for key, value in values.items() if value is not None}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        self.registry._update(self, self._key(labels), amount)
+
+
+class Gauge(_Metric):
+    """
+    Per-process value. With scope="process" (default) the live processes' values
+    are summed. A scope="global" gauge is computed by the process answering the
+    scrape only, as fn(merged) where merged is {metric name: {label values: value}}
+    of everything else, e.g. a queue depth or a ratio of two summed counters.
+    """
+    kind = "gauge"
+
+    def __init__(self, registry, name, help, labels=(), fn=None, scope="process"):
+        super().__init__(registry, name, help, labels, fn)
+        self.scope = scope
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        self.registry._update(self, self._key(labels), value)
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Every process (each gunicorn worker, the screening worker and its pool)
+    keeps its own values and, when directory is set, rewrites them to
+    <directory>/<pid>.json at most every flush_interval seconds from a
+    background thread. A scrape merges all the files: counters and histograms
+    are summed over every process that ever wrote one (so nothing is lost when
+    a worker is recycled), per-process gauges over the live ones only. Without
+    a directory the registry only reports the current process.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics = {}  # name -> metric, in registration order
+        self._reset()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self._flush_at_exit)
+        # A forked child starts from zero and writes its own file
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._values = {}  # name -> {label values: number or [bucket counts..., sum, count]}
+        self._lock = threading.Lock()
+        self._flusher_pid = None
+
+    # -------------------- DECLARATION --------------------
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=(), fn=None):
+        return self._register(Counter(self, name, help, labels, fn))
+
+    def gauge(self, name, help, labels=(), fn=None, scope="process"):
+        return self._register(Gauge(self, name, help, labels, fn, scope))
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, help, labels, buckets))
+
+    # -------------------- UPDATES --------------------
+    def _update(self, metric, key, value):
+        with self._lock:
+            series = self._values.setdefault(metric.name, {})
+            if metric.kind == "histogram":
+                counts = series.get(key)
+                if counts is None:
+                    counts = series[key] = [0] * (len(metric.buckets) + 2)
+                for i, bound in enumerate(metric.buckets):
+                    if value <= bound:
+                        counts[i] += 1
+                counts[-2] += value
+                counts[-1] += 1
+            else:
+                series[key] = series.get(key, 0) + value
+        self.start_flusher()
+
+    def start_flusher(self):
+        """Start this process's background writer (no-op without a directory or if running)."""
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True).start()
+
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print("Metrics flush error:", e)
+
+    # -------------------- COLLECTION --------------------
+    def snapshot(self):
+        """This process's values (callback metrics read now), as JSON-friendly lists."""
+        with self._lock:
+            values = {name: dict(series) for name, series in self._values.items()}
+        for metric in self.metrics.values():
+            if metric.fn is not None and getattr(metric, "scope", "process") == "process":
+                try:
+                    values[metric.name] = metric.collect()
+                except Exception as e:
+                    print(f"Metrics callback error ({metric.name}):", e)
+        return {name: [[list(key), value] for key, value in series.items()] for name, series in values.items()}
+
+    def flush(self):
+        """Write this process's snapshot to <directory>/<pid>.json atomically."""
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "metrics": self.snapshot()}, f)
+        os.replace(tmp_path, path)
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except OSError:
+            pass  # Directory already removed (e.g. a temporary instance folder)
+
+    def clear_directory(self):
+        """Remove every process's file (call once at server start, before workers fork)."""
+        for path in glob.glob(os.path.join(self.directory or "", "*.json")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _merged(self):
+        own_pid = os.getpid()
+        snapshots = [(own_pid, self.snapshot())]
+        for path in glob.glob(os.path.join(self.directory or "", "*.json")) if self.directory else []:
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue  # Being replaced right now; its values are picked up next scrape
+            if data["pid"] != own_pid:
+                snapshots.append((data["pid"], data["metrics"]))
+
+        merged = {}
+        for pid, metrics in snapshots:
+            alive = pid == own_pid or _pid_alive(pid)
+            for name, samples in metrics.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                series = merged.setdefault(name, {})
+                for key, value in samples:
+                    key = tuple(key)
+                    if metric.kind == "histogram":
+                        old = series.get(key)
+                        series[key] = value if old is None else [a + b for a, b in zip(old, value)]
+                    else:
+                        series[key] = series.get(key, 0) + value
+        for metric in self.metrics.values():
+            if metric.fn is not None and getattr(metric, "scope", "process") == "global":
+                try:
+                    merged[metric.name] = metric.collect(merged)
+                except Exception as e:
+                    print(f"Metrics callback error ({metric.name}):", e)
+        return merged
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        merged = self._merged()
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in sorted(merged.get(metric.name, {}).items()):
+                if metric.kind != "histogram":
+                    lines.append(f"{metric.name}{_format_labels(metric.labels, key)} {_format_value(value)}")
+                    continue
+                for bound, count in zip(metric.buckets + (float("inf"),), value[:-2] + [value[-1]]):
+                    le = (("le", _format_value(bound)),)
+                    lines.append(f"{metric.name}_bucket{_format_labels(metric.labels, key, le)} {_format_value(count)}")
+                lines.append(f"{metric.name}_sum{_format_labels(metric.labels, key)} {_format_value(value[-2])}")
+                lines.append(f"{metric.name}_count{_format_labels(metric.labels, key)} {_format_value(value[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+def init_metrics(app):
+    """
+    Create the app's MetricsRegistry, count and time every request by endpoint
+    and serve everything at GET /metrics for Prometheus.
+
+    Worker processes share METRICS_DIR (default instance/metrics); clear it when
+    the server starts (gunicorn.conf.py does). When METRICS_TOKEN is set the
+    endpoint requires "Authorization: Bearer <token>".
+    """
+    app.config.setdefault('METRICS_DIR', os.environ.get("SMARTHIRE_METRICS_DIR", os.path.join(app.instance_path, "metrics")))
+    app.config.setdefault('METRICS_FLUSH_INTERVAL', 1.0)
+    app.config.setdefault('METRICS_TOKEN', os.environ.get("SMARTHIRE_METRICS_TOKEN"))
+    registry = MetricsRegistry(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'])
+
+    requests_total = registry.counter(
+        "smarthire_http_requests_total", "HTTP requests handled, by endpoint and status code.", ("endpoint", "status")
+    )
+    request_seconds = registry.histogram(
+        "smarthire_http_request_duration_seconds", "Time to build a response, by endpoint.", ("endpoint",)
+    )
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def count_request(response):
+        endpoint = request.endpoint or "unmatched"
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            request_seconds.observe(time.perf_counter() - started, endpoint=endpoint)
+        requests_total.inc(endpoint=endpoint, status=response.status_code)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        token = app.config['METRICS_TOKEN']
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    return registry
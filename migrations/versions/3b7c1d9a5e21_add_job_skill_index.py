@@ -0,0 +1,37 @@
+"""Add job_skill inverted index
+
+Revision ID: 3b7c1d9a5e21
+Revises: e4fa52fed968
+Create Date: 2026-10-17 20:10:42.118503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1d9a5e21'
+down_revision: Union[str, Sequence[str], None] = 'e4fa52fed968'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_skill',
+        sa.Column('skill', sa.String(length=100), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id']),
+        sa.PrimaryKeyConstraint('skill', 'job_id')
+    )
+    op.create_index(op.f('ix_job_skill_job_id'), 'job_skill', ['job_id'], unique=False)
+    # Existing jobs are indexed with: flask rebuild-job-skill-index
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_skill_job_id'), table_name='job_skill')
+    op.drop_table('job_skill')
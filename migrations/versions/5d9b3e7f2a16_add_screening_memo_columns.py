@@ -0,0 +1,41 @@
+"""Add screening memo columns and one-row-per-screening unique key
+
+Revision ID: 5d9b3e7f2a16
+Revises: c51e0f7a9d34
+Create Date: 2026-10-17 21:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9b3e7f2a16'
+down_revision: Union[str, Sequence[str], None] = 'c51e0f7a9d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('screening') as batch_op:
+        batch_op.add_column(sa.Column('resume_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('job_description_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('scorer_version', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('screening_key', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_screening_memo', ['job_description_hash', 'scorer_version', 'resume_hash'], unique=False)
+        batch_op.create_unique_constraint('uq_screening_screening_key', ['screening_key'])
+    # Existing rows keep NULL keys: they are neither memo hits nor checked for duplicates
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('screening') as batch_op:
+        batch_op.drop_constraint('uq_screening_screening_key', type_='unique')
+        batch_op.drop_index('ix_screening_memo')
+        batch_op.drop_column('screening_key')
+        batch_op.drop_column('scorer_version')
+        batch_op.drop_column('job_description_hash')
+        batch_op.drop_column('resume_hash')
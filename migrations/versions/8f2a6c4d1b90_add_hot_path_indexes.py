@@ -0,0 +1,52 @@
+"""Add username_lower and indexes for login and dashboard queries
+
+Revision ID: 8f2a6c4d1b90
+Revises: 3b7c1d9a5e21
+Create Date: 2026-10-17 20:25:07.512944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2a6c4d1b90'
+down_revision: Union[str, Sequence[str], None] = '3b7c1d9a5e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Add nullable, backfill, then tighten. The unique index fails if two existing
+    # usernames differ only in case; rename one of them before upgrading.
+    op.add_column('User', sa.Column('username_lower', sa.String(length=255), nullable=True))
+    user = sa.table('User', sa.column('username', sa.String), sa.column('username_lower', sa.String))
+    op.execute(user.update().values(username_lower=sa.func.lower(user.c.username)))
+    with op.batch_alter_table('User') as batch_op:
+        batch_op.alter_column('username_lower', existing_type=sa.String(length=255), nullable=False)
+        batch_op.create_index(batch_op.f('ix_User_username_lower'), ['username_lower'], unique=True)
+
+    op.create_index('ix_job_status_created_at', 'job', ['status', 'created_at'], unique=False)
+    op.create_index('ix_job_created_at_id', 'job', ['created_at', 'id'], unique=False)
+    op.create_index('ix_resume_applicant_id', 'resume', ['applicant_id'], unique=False)
+    op.create_index('ix_application_applicant_id_job_id', 'application', ['applicant_id', 'job_id'], unique=False)
+    op.create_index('ix_screening_screened_at_id', 'screening', ['screened_at', 'id'], unique=False)
+    op.create_index('ix_screening_job_id_match_score', 'screening', ['job_id', 'match_score'], unique=False)
+    op.create_index('ix_screening_resume_id', 'screening', ['resume_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_screening_resume_id', table_name='screening')
+    op.drop_index('ix_screening_job_id_match_score', table_name='screening')
+    op.drop_index('ix_screening_screened_at_id', table_name='screening')
+    op.drop_index('ix_application_applicant_id_job_id', table_name='application')
+    op.drop_index('ix_resume_applicant_id', table_name='resume')
+    op.drop_index('ix_job_created_at_id', table_name='job')
+    op.drop_index('ix_job_status_created_at', table_name='job')
+    with op.batch_alter_table('User') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_User_username_lower'))
+        batch_op.drop_column('username_lower')
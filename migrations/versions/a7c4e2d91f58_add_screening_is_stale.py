@@ -0,0 +1,32 @@
+"""Add Screening.is_stale for incremental rescoring after job edits
+
+Revision ID: a7c4e2d91f58
+Revises: 5d9b3e7f2a16
+Create Date: 2026-10-17 21:34:52.106318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2d91f58'
+down_revision: Union[str, Sequence[str], None] = '5d9b3e7f2a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('screening') as batch_op:
+        batch_op.add_column(sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.create_index('ix_screening_stale', ['is_stale', 'job_id', 'screened_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('screening') as batch_op:
+        batch_op.drop_index('ix_screening_stale')
+        batch_op.drop_column('is_stale')
@@ -0,0 +1,69 @@
+"""Add Job.status_key, Applicant.created_at and the dashboard_rollup table
+
+Revision ID: b93d5f1e6c07
+Revises: a7c4e2d91f58
+Create Date: 2026-10-17 22:18:40.527193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93d5f1e6c07'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e2d91f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Add nullable, backfill from status, then tighten
+    op.add_column('job', sa.Column('status_key', sa.String(length=20), nullable=True))
+    job = sa.table('job', sa.column('status', sa.String), sa.column('status_key', sa.String))
+    op.execute(job.update().values(status_key=sa.func.lower(sa.func.coalesce(job.c.status, 'pending'))))
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.alter_column('status_key', existing_type=sa.String(length=20), nullable=False)
+        batch_op.drop_index('ix_job_status_created_at')
+        batch_op.create_index('ix_job_status_key_created_at_id', ['status_key', 'created_at', 'id'], unique=False)
+
+    # Existing profiles keep NULL: their sign-up day is unknown
+    op.add_column('applicant', sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'dashboard_rollup',
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('bucket', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('metric', 'bucket')
+    )
+    op.create_index('ix_dashboard_rollup_metric_value', 'dashboard_rollup', ['metric', 'value', 'bucket'], unique=False)
+
+    # Backfill the rollups with grouped counts (same as 'flask rebuild-dashboard-rollups')
+    rollup = sa.table('dashboard_rollup', sa.column('metric'), sa.column('bucket'), sa.column('value'))
+    screening = sa.table('screening', sa.column('job_id', sa.Integer))
+    columns = ['metric', 'bucket', 'value']
+    for table_name in ('applicant', 'employer', 'resume'):
+        op.execute(rollup.insert().from_select(columns, sa.select(
+            sa.literal('records'), sa.literal(table_name + 's'), sa.func.count()
+        ).select_from(sa.table(table_name))))
+    op.execute(rollup.insert().from_select(columns, sa.select(
+        sa.literal('jobs_by_status'), job.c.status_key, sa.func.count()
+    ).group_by(job.c.status_key)))
+    op.execute(rollup.insert().from_select(columns, sa.select(
+        sa.literal('screenings_by_job'), sa.cast(screening.c.job_id, sa.String(length=64)), sa.func.count()
+    ).where(screening.c.job_id.isnot(None)).group_by(screening.c.job_id)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dashboard_rollup_metric_value', table_name='dashboard_rollup')
+    op.drop_table('dashboard_rollup')
+    with op.batch_alter_table('applicant') as batch_op:
+        batch_op.drop_column('created_at')
+    with op.batch_alter_table('job') as batch_op:
+        batch_op.drop_index('ix_job_status_key_created_at_id')
+        batch_op.create_index('ix_job_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.drop_column('status_key')
@@ -0,0 +1,47 @@
+"""Add resume_blob table and Resume.content_hash
+
+Revision ID: c51e0f7a9d34
+Revises: 8f2a6c4d1b90
+Create Date: 2026-10-17 20:41:19.204771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e0f7a9d34'
+down_revision: Union[str, Sequence[str], None] = '8f2a6c4d1b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resume_blob',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    with op.batch_alter_table('resume') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resume_content_hash'), ['content_hash'], unique=False)
+        batch_op.create_index('ix_resume_filename', ['filename'], unique=False)
+        batch_op.create_foreign_key('fk_resume_content_hash', 'resume_blob', ['content_hash'], ['content_hash'])
+    # Existing files are moved into the blob store with: flask fold-resume-duplicates
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Resumes already folded into the blob store lose their link to the file
+    with op.batch_alter_table('resume') as batch_op:
+        batch_op.drop_constraint('fk_resume_content_hash', type_='foreignkey')
+        batch_op.drop_index('ix_resume_filename')
+        batch_op.drop_index(batch_op.f('ix_resume_content_hash'))
+        batch_op.drop_column('content_hash')
+    op.drop_table('resume_blob')
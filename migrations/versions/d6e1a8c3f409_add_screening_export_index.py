@@ -0,0 +1,28 @@
+"""Add the (job_id, screened_at, id) index on screening for exports
+
+Revision ID: d6e1a8c3f409
+Revises: b93d5f1e6c07
+Create Date: 2026-10-17 23:41:12.308514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e1a8c3f409'
+down_revision: Union[str, Sequence[str], None] = 'b93d5f1e6c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_screening_job_id_screened_at_id', 'screening', ['job_id', 'screened_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_screening_job_id_screened_at_id', table_name='screening')
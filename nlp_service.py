@@ -0,0 +1,102 @@
+# nlp_service.py - Shared spaCy pipeline trimmed to entity recognition, with batching and caching
+
+import hashlib
+import json
+import multiprocessing
+import threading
+
+from text_cache import ResumeTextCache
+
+# Entity labels the screening uses (see extract_professions in app.py)
+ENTITY_LABELS = ("ORG", "WORK_OF_ART", "PRODUCT")
+
+# en_core_web_sm components that play no part in NER. They are excluded at load
+# time (never loaded at all). tok2vec stays: the model's NER listens to it.
+EXCLUDED_COMPONENTS = ("parser", "tagger", "attribute_ruler", "lemmatizer", "senter")
+
+# Bump when the cached entity format changes
+CACHE_VERSION = 1
+
+
+class NlpService:
+    """
+    Loads spaCy once (lazily) with only the components named entity recognition
+    needs, runs batches through nlp.pipe, and caches the entities found in each
+    text on disk, keyed by the SHA-256 of the model, labels and text. A resume's
+    text is fixed by its PDF, so each resume is only run through the model once
+    across screenings, workers and restarts.
+    """
+
+    def __init__(self, model="en_core_web_sm", cache_dir=None, cache_max_bytes=50 * 1024 * 1024,
+                 labels=ENTITY_LABELS, batch_size=32, n_process=1):
+        self.model = model
+        self.labels = tuple(labels)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self._nlp = None
+        self._lock = threading.Lock()
+        self._cache = ResumeTextCache(cache_dir, max_bytes=cache_max_bytes) if cache_dir else None
+        self.cache_hits = 0  # Texts answered from the entity cache since this process started
+        self.cache_misses = 0
+
+    @property
+    def nlp(self):
+        """The shared spaCy pipeline, loaded on first use."""
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    import spacy
+                    self._nlp = spacy.load(self.model, exclude=list(EXCLUDED_COMPONENTS))
+        return self._nlp
+
+    def cache_key(self, text):
+        key = f"{CACHE_VERSION}|{self.model}|{','.join(self.labels)}|{text}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _get_cached(self, key):
+        if self._cache is None:
+            return None
+        data = self._cache.get(key)
+        return None if data is None else [tuple(entity) for entity in json.loads(data)]
+
+    def _put_cached(self, key, entities):
+        if self._cache is not None:
+            try:
+                self._cache.put(key, json.dumps(entities))
+            except OSError as e:
+                print("Entity cache error:", e)
+
+    def _entities(self, doc):
+        return [(ent.text, ent.label_) for ent in doc.ents if ent.label_ in self.labels]
+
+    def entities(self, text):
+        """[(entity text, label)] for one text, restricted to self.labels."""
+        return self.entities_many([text])[0]
+
+    def entities_many(self, texts, n_process=None):
+        """
+        Entities for many texts, in order. Cached texts are answered from disk;
+        the rest go through nlp.pipe in batches of batch_size, on n_process
+        processes (forced to 1 inside daemonic pool workers, which cannot fork).
+        """
+        results = [None] * len(texts)
+        keys = [self.cache_key(text) for text in texts]
+        misses = []
+        for i, key in enumerate(keys):
+            results[i] = self._get_cached(key)
+            if results[i] is None:
+                misses.append(i)
+        with self._lock:
+            self.cache_hits += len(texts) - len(misses)
+            self.cache_misses += len(misses)
+        if not misses:
+            return results
+
+        n_process = n_process or self.n_process
+        if n_process > 1 and (len(misses) < 2 * self.batch_size or multiprocessing.current_process().daemon):
+            n_process = 1  # Not worth starting processes for (or not allowed to)
+        docs = self.nlp.pipe((texts[i] for i in misses), batch_size=self.batch_size, n_process=n_process)
+        for i, doc in zip(misses, docs):
+            results[i] = self._entities(doc)
+            self._put_cached(keys[i], results[i])
+        return results
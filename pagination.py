@@ -0,0 +1,50 @@
+# pagination.py - Keyset (cursor) pagination helpers for the dashboard tables
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, tuple_
+
+
+def encode_cursor(values):
+    """Turn the sort-key values of the last row on a page into an opaque URL-safe cursor."""
+    plain = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(plain).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort_columns):
+    """Inverse of encode_cursor; returns None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if len(values) != len(sort_columns):
+            return None
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value else value
+            for column, value in zip(sort_columns, values)
+        ]
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(query, sort_columns, cursor=None, limit=20):
+    """
+    Return (rows, next_cursor) for one page of query, newest first.
+
+    Rows are ordered by sort_columns descending (the last column must be unique,
+    e.g. the primary key) and the page starts strictly after cursor, so the cost
+    of a page does not grow with how deep into the table it is, unlike OFFSET.
+    """
+    after = decode_cursor(cursor, sort_columns)
+    if after is not None:
+        query = query.filter(tuple_(*sort_columns) < tuple_(*after))
+    rows = query.order_by(*[column.desc() for column in sort_columns]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in sort_columns])
+    return rows, next_cursor
@@ -0,0 +1,200 @@
+# profiling.py - Per-request stage timings, Server-Timing header and sampled cProfile dumps
+
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Set once by init_profiling(); while False, span() returns a shared no-op context,
+# profiled() leaves functions unwrapped and no hooks or listeners are installed
+_enabled = False
+NULL_SPAN = nullcontext()
+
+# Per-request JSON lines; app.logger would drop them outside debug mode (root level WARNING)
+logger = logging.getLogger("smarthire.profiling")
+
+
+class RequestProfile:
+    """Stage name -> (total seconds, calls) for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = {}
+        self.calls = {}
+        self.active = set()  # Stages currently open, so nested/recursive spans count once
+        self.profiler = None
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def server_timing(self, total_seconds):
+        """Server-Timing header value: one metric per stage plus the total, in milliseconds."""
+        metrics = [f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.seconds.items()]
+        metrics.append(f'total;dur={total_seconds * 1000:.1f}')
+        return ", ".join(metrics)
+
+
+class _Span:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.profile.active.add(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profile.add(self.name, time.perf_counter() - self.started)
+        self.profile.active.discard(self.name)
+        return False
+
+
+def _current_profile():
+    if has_request_context():
+        return g.get("profile")
+    return None
+
+
+def span(name):
+    """
+    Context manager timing a block as stage `name` of the current request.
+    Outside a profiled request (profiling off, CLI, pool worker processes) it
+    is a no-op.
+    """
+    if not _enabled:
+        return NULL_SPAN
+    profile = _current_profile()
+    if profile is None or name in profile.active:
+        return NULL_SPAN
+    return _Span(profile, name)
+
+
+def profiled(name):
+    """Decorator form of span(); the function is returned as is when profiling is off."""
+    def decorator(func):
+        if not _enabled:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- SQL and template timing (hooked up only when profiling is on) ---
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    if profile is not None and conn.info.get("profile_start"):
+        profile.add("db", time.perf_counter() - conn.info["profile_start"].pop())
+
+
+def _before_render(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None:
+        g.setdefault("render_start", []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None and g.get("render_start"):
+        profile.add("render", time.perf_counter() - g.render_start.pop())
+
+
+def init_profiling(app):
+    """
+    Time each request and its stages (functions marked with @profiled, blocks
+    in span(), SQL statements as "db", template rendering as "render").
+
+    Each response gets a Server-Timing header and one JSON log line. With
+    PROFILING_SAMPLE_RATE > 0 that fraction of requests also runs under
+    cProfile; the ones slower than PROFILING_SLOW_MS are dumped to
+    PROFILING_DUMP_DIR (open with pstats or snakeviz).
+
+    Off unless PROFILING_ENABLED (or SMARTHIRE_PROFILING=1) is set. It must be
+    decided before the profiled functions are defined, so call this first.
+    """
+    global _enabled
+    app.config.setdefault('PROFILING_ENABLED', os.environ.get("SMARTHIRE_PROFILING", "0") == "1")
+    app.config.setdefault('PROFILING_SAMPLE_RATE', 0.0)
+    app.config.setdefault('PROFILING_SLOW_MS', 500)
+    app.config.setdefault('PROFILING_DUMP_DIR', os.path.join(app.instance_path, "profiles"))
+    _enabled = bool(app.config['PROFILING_ENABLED'])
+    if not _enabled:
+        return
+
+    if not logger.handlers:
+        # Own level and handler (stderr, gunicorn's error log), whatever the root logger is set to
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    @app.before_request
+    def start_profile():
+        g.profile = RequestProfile()
+        if random.random() < app.config['PROFILING_SAMPLE_RATE']:
+            g.profile.profiler = cProfile.Profile()
+            g.profile.profiler.enable()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop("profile", None)
+        if profile is None:
+            return response
+        total = time.perf_counter() - profile.started
+        dump_path = None
+        if profile.profiler is not None:
+            profile.profiler.disable()
+            if total * 1000 >= app.config['PROFILING_SLOW_MS']:
+                os.makedirs(app.config['PROFILING_DUMP_DIR'], exist_ok=True)
+                dump_path = os.path.join(
+                    app.config['PROFILING_DUMP_DIR'],
+                    f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unknown'}-{os.getpid()}.prof"
+                )
+                profile.profiler.dump_stats(dump_path)
+
+        response.headers["Server-Timing"] = profile.server_timing(total)
+        logger.info(json.dumps({
+            "event": "request",
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 2),
+            "stages_ms": {name: round(seconds * 1000, 2) for name, seconds in profile.seconds.items()},
+            "stage_calls": profile.calls,
+            "profile": dump_path,
+        }))
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # after_request does not run for every failure; never leave cProfile switched on
+        profile = g.pop("profile", None)
+        if profile is not None and profile.profiler is not None:
+            profile.profiler.disable()
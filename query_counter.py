@@ -0,0 +1,75 @@
+# query_counter.py - Per-request SQL statement counter for catching N+1 queries
+
+import time
+from functools import wraps
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised (in testing mode) when a request runs more SQL statements than its budget."""
+
+
+def query_budget(limit):
+    """Give one view its own statement budget instead of SQL_QUERY_BUDGET."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return view(*args, **kwargs)
+        wrapper.query_budget = limit
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_stats" in g:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_stats" in g:
+        started = conn.info["query_start"].pop()
+        g.sql_stats["count"] += 1
+        g.sql_stats["seconds"] += time.perf_counter() - started
+
+
+def init_query_counter(app):
+    """
+    Count the SQL statements (and their total time) each request runs.
+
+    Active in debug and testing mode, or whenever SQL_QUERY_COUNTER is set.
+    Every counted request is logged; a request above its budget is logged as a
+    warning, and raises QueryBudgetExceeded when app.testing is on so a test
+    that renders the page fails.
+    """
+    app.config.setdefault('SQL_QUERY_COUNTER', False)
+    app.config.setdefault('SQL_QUERY_BUDGET', 25)
+
+    # Listening on the Engine class covers every engine, including ones created later
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_query_count():
+        if app.debug or app.testing or app.config['SQL_QUERY_COUNTER']:
+            g.sql_stats = {"count": 0, "seconds": 0.0}
+
+    @app.after_request
+    def report_query_count(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, "query_budget", app.config['SQL_QUERY_BUDGET'])
+        message = "%s %s: %d SQL statements in %.1f ms (budget %d)" % (
+            request.method, request.path, stats["count"], stats["seconds"] * 1000, budget
+        )
+        if stats["count"] > budget:
+            app.logger.warning("Query budget exceeded: " + message)
+            if app.testing:
+                raise QueryBudgetExceeded(message)
+        else:
+            app.logger.info(message)
+        return response
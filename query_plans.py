@@ -0,0 +1,57 @@
+# query_plans.py - EXPLAIN the hot queries and report the ones that scan a whole table
+
+from sqlalchemy import text
+
+
+def compile_query(query, dialect):
+    """Render a Query/select as SQL for this dialect with its parameters inlined."""
+    statement = getattr(query, "statement", query)
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain(connection, sql):
+    """
+    Return (plan lines, problems) for one SELECT. Problems are full table scans
+    and sorts the database has to do itself because no index provides the order.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        rows = connection.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+        lines = [row[-1] for row in rows]
+        problems = [
+            line for line in lines
+            if (line.startswith("SCAN ") and "USING" not in line) or "TEMP B-TREE" in line
+        ]
+    elif dialect in ("mysql", "mariadb"):
+        rows = connection.execute(text("EXPLAIN " + sql)).mappings().all()
+        lines = [
+            f"{row['table']}: type={row['type']} key={row['key']} extra={row.get('Extra') or ''}"
+            for row in rows
+        ]
+        problems = [
+            line for line, row in zip(lines, rows)
+            if row["type"] == "ALL" or "filesort" in (row.get("Extra") or "")
+        ]
+    elif dialect == "postgresql":
+        lines = [row[0] for row in connection.execute(text("EXPLAIN " + sql)).all()]
+        problems = [line for line in lines if "Seq Scan" in line]
+    else:
+        raise ValueError(f"EXPLAIN check not supported for dialect '{dialect}'")
+    return lines, problems
+
+
+def check_queries(engine, queries):
+    """
+    EXPLAIN every {name: query} and return {name: (sql, plan lines, problems)}.
+
+    MySQL and PostgreSQL choose plans from table statistics, so run this
+    against a database of realistic size; on nearly empty tables a full scan
+    can legitimately be the cheapest plan. SQLite plans are stable either way.
+    """
+    results = {}
+    with engine.connect() as connection:
+        for name, query in queries.items():
+            sql = compile_query(query, engine.dialect)
+            lines, problems = explain(connection, sql)
+            results[name] = (sql, lines, problems)
+    return results
@@ -0,0 +1,157 @@
+# score_matrix.py - Precomputed resume x job match scores for top-k candidate ranking
+
+import os
+import threading
+
+import numpy as np
+
+from tfidf_index import file_lock
+
+# Bump whenever the on-disk layout changes; older files are ignored and need a rebuild
+FORMAT_VERSION = 1
+
+
+class ScoreMatrix:
+    """
+    Sparse resume x job matrix of match scores (0-100, same scale as
+    Screening.match_score), stored column by column: each job maps to the ids
+    of the resumes with a non-zero score and those scores. Only the jobs the
+    caller chooses to score (approved ones) have a column.
+
+    Columns are replaced when a job is (re)scored and merged into when new
+    resumes are scored, so neither needs a full rebuild. Scores are a snapshot
+    of the TF-IDF index at the time they were computed; 'flask
+    rebuild-score-matrix' refreshes all of them. Saved as one .npz file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self.columns = {}  # job id -> (resume ids, scores)
+
+    # -------------------- PERSISTENCE --------------------
+    def refresh(self):
+        """Reload from disk if another process saved a newer copy."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        with self._lock:
+            if mtime == self._loaded_mtime:
+                return
+            try:
+                self._read(self.path)
+            except Exception as e:
+                print("Score matrix load error (run 'flask rebuild-score-matrix'):", e)
+                self.columns = {}
+            self._loaded_mtime = mtime
+
+    def _read(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"format version {version}, expected {FORMAT_VERSION}")
+            job_ids, indptr = data["job_ids"].tolist(), data["indptr"]
+            resume_ids, scores = data["resume_ids"], data["scores"]
+            self.columns = {
+                job_id: (resume_ids[indptr[col]:indptr[col + 1]], scores[indptr[col]:indptr[col + 1]])
+                for col, job_id in enumerate(job_ids)
+            }
+
+    def save(self):
+        """Write the matrix atomically so readers never see a partial file."""
+        with self._lock:
+            job_ids = list(self.columns)
+            columns = [self.columns[job_id] for job_id in job_ids]
+            indptr = np.zeros(len(columns) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(ids) for ids, _ in columns])
+            resume_ids = np.concatenate([c[0] for c in columns]) if columns else np.zeros(0, dtype=np.int64)
+            scores = np.concatenate([c[1] for c in columns]) if columns else np.zeros(0, dtype=np.float32)
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                version=np.array(FORMAT_VERSION),
+                job_ids=np.array(job_ids, dtype=np.int64),
+                indptr=indptr,
+                resume_ids=resume_ids,
+                scores=scores,
+            )
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+    # -------------------- UPDATES --------------------
+    @staticmethod
+    def _column(resume_ids, scores):
+        resume_ids = np.asarray(resume_ids, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float32)
+        keep = scores > 0
+        return resume_ids[keep], scores[keep]
+
+    def update(self, columns=None, merge=None, remove_jobs=(), remove_resumes=()):
+        """
+        Apply changes and save once. columns ({job id: (resume ids, scores)})
+        replace whole columns; merge (same shape) replaces only the given
+        resumes' scores in columns that already exist. Picks up changes saved
+        by other processes first so none are lost.
+        """
+        with self._lock, file_lock(self.path):
+            self.refresh()
+            for job_id in remove_jobs:
+                self.columns.pop(job_id, None)
+            if len(remove_resumes):
+                for job_id, (ids, scores) in self.columns.items():
+                    keep = ~np.isin(ids, remove_resumes)
+                    self.columns[job_id] = (ids[keep], scores[keep])
+            for job_id, (ids, scores) in (columns or {}).items():
+                self.columns[job_id] = self._column(ids, scores)
+            for job_id, (ids, scores) in (merge or {}).items():
+                if job_id not in self.columns:
+                    continue
+                old_ids, old_scores = self.columns[job_id]
+                new_ids, new_scores = self._column(ids, scores)
+                keep = ~np.isin(old_ids, ids)
+                self.columns[job_id] = (
+                    np.concatenate([old_ids[keep], new_ids]),
+                    np.concatenate([old_scores[keep], new_scores])
+                )
+            self.save()
+
+    def rebuild(self, columns):
+        """Replace every column with {job id: (resume ids, scores)} and save."""
+        with self._lock, file_lock(self.path):
+            self.columns = {job_id: self._column(ids, scores) for job_id, (ids, scores) in columns.items()}
+            self.save()
+
+    def job_ids(self):
+        self.refresh()
+        with self._lock:
+            return list(self.columns)
+
+    def __contains__(self, job_id):
+        self.refresh()
+        return job_id in self.columns
+
+    # -------------------- QUERIES --------------------
+    def top_k(self, job_id, k):
+        """
+        The k best (resume id, score) pairs for a job, best first, or None if
+        the job has no column. argpartition finds the k best in linear time;
+        only those k are then sorted.
+        """
+        self.refresh()
+        with self._lock:
+            column = self.columns.get(job_id)
+        if column is None:
+            return None
+        resume_ids, scores = column
+        if k <= 0:
+            return []
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((resume_ids[top], -scores[top]))]  # Score descending, then resume id
+        return [(int(resume_ids[i]), round(float(scores[i]), 2)) for i in top]
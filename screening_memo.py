@@ -0,0 +1,87 @@
+# screening_memo.py - Memoized screening results with an in-process LRU tier over a persistent tier
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def text_sha256(text):
+    """Hex SHA-256 of a string's UTF-8 bytes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ScreeningMemo:
+    """
+    Results of the scoring pipeline ({"matched_skills": [...], "match_score": x})
+    keyed by (resume content hash, job description hash, scorer version), so a
+    resume whose bytes were already screened against the same description is
+    not scored again.
+
+    Lookups go to a bounded LRU dict in this process first, then to
+    load_many(keys) -> {key: result}, the persistent tier supplied by the caller
+    (the Screening table). Whatever the persistent tier returns is kept in the
+    LRU. Hits and misses of each tier are counted for the metrics.
+    """
+
+    def __init__(self, load_many, max_entries=4096):
+        self.load_many = load_many
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _remember(self, key, result):
+        # Caller holds the lock
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """{key: result} for every key found in either tier."""
+        found, missing = {}, []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                result = self._entries.get(key)
+                if result is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = result
+            self.memory_hits += len(found)
+
+        loaded = self.load_many(missing) if missing else {}
+        with self._lock:
+            for key, result in loaded.items():
+                self._remember(key, result)
+            self.persistent_hits += len(loaded)
+            self.misses += len(missing) - len(loaded)
+        found.update(loaded)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put(self, key, result):
+        """Remember a freshly computed result (the caller stores it in the persistent tier)."""
+        with self._lock:
+            self._remember(key, result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters since this process started, plus the overall hit ratio."""
+        with self._lock:
+            lookups = self.memory_hits + self.persistent_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else None,
+            }
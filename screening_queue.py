@@ -0,0 +1,176 @@
+# screening_queue.py - Local SQLite-backed queue of resume screening jobs
+
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screening_task (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    resume_id INTEGER NOT NULL,
+    job_id INTEGER,
+    job_description TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    screening_id INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    worker_host TEXT,
+    worker_pid INTEGER,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_screening_task_status ON screening_task (status, id);
+"""
+
+# Columns added after the first release; queue files created before get them on open
+ADDED_COLUMNS = {"worker_host": "TEXT", "worker_pid": "INTEGER", "heartbeat_at": "REAL"}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ScreeningQueue:
+    """
+    Durable FIFO of screening requests stored in a SQLite file, so the web
+    workers can hand off CPU-heavy screenings to the 'flask screening-worker'
+    process without any outside service.
+
+    A claimed task records the claiming worker (host and pid) and a heartbeat
+    that the worker refreshes while it runs, so a starting worker re-queues only
+    the tasks of workers that are gone, never those of one still running.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.host = socket.gethostname()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(screening_task)")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE screening_task ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps this safe across threads and forks
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, resume_id, job_id, job_description):
+        """Add a screening request and return its task id."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO screening_task (resume_id, job_id, job_description, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (resume_id, job_id, job_description, STATUS_QUEUED, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self):
+        """Atomically take the oldest queued task and mark it running by this process; None if the queue is empty."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")  # Write lock, so two workers never claim the same row
+            try:
+                row = conn.execute(
+                    "SELECT * FROM screening_task WHERE status = ? ORDER BY id LIMIT 1",
+                    (STATUS_QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    now = time.time()
+                    conn.execute(
+                        "UPDATE screening_task SET status = ?, updated_at = ?, worker_host = ?, worker_pid = ?, "
+                        "heartbeat_at = ? WHERE id = ?",
+                        (STATUS_RUNNING, now, self.host, os.getpid(), now, row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return dict(row, status=STATUS_RUNNING) if row is not None else None
+
+    def complete(self, task_id, screening_id):
+        self._finish(task_id, STATUS_DONE, screening_id=screening_id)
+
+    def fail(self, task_id, error):
+        self._finish(task_id, STATUS_FAILED, error=str(error))
+
+    def _finish(self, task_id, status, screening_id=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE screening_task SET status = ?, screening_id = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, screening_id, error, time.time(), task_id)
+            )
+
+    def heartbeat(self):
+        """Mark this process's running tasks as still being worked on."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE screening_task SET heartbeat_at = ? WHERE status = ? AND worker_host = ? AND worker_pid = ?",
+                (time.time(), STATUS_RUNNING, self.host, os.getpid())
+            )
+
+    def requeue_abandoned(self, stale_after):
+        """
+        Put tasks left 'running' by a worker that died back in the queue and
+        return how many. A task is abandoned when its worker's pid is gone (same
+        host) or its heartbeat is older than stale_after seconds (any host, or a
+        pid reused since).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, worker_host, worker_pid, heartbeat_at FROM screening_task WHERE status = ?",
+                    (STATUS_RUNNING,)
+                ).fetchall()
+                abandoned = [
+                    row["id"] for row in rows
+                    if row["heartbeat_at"] is None or now - row["heartbeat_at"] > stale_after
+                    or (row["worker_host"] == self.host and not _pid_alive(row["worker_pid"]))
+                ]
+                for task_id in abandoned:
+                    conn.execute(
+                        "UPDATE screening_task SET status = ?, updated_at = ?, worker_host = NULL, worker_pid = NULL, "
+                        "heartbeat_at = NULL WHERE id = ? AND status = ?",
+                        (STATUS_QUEUED, now, task_id, STATUS_RUNNING)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(abandoned)
+
+    def get(self, task_id):
+        """Return a task as a dict, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM screening_task WHERE id = ?", (task_id,)).fetchone()
+        return dict(row) if row else None
+
+    def depth(self):
+        """Number of tasks still waiting to be picked up."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM screening_task WHERE status = ?", (STATUS_QUEUED,)
+            ).fetchone()[0]
@@ -0,0 +1,97 @@
+# skill_matcher.py - Single-pass matcher for the skill/profession taxonomy
+
+import json
+import re
+from collections import namedtuple
+
+# Words, keeping dotted names and trailing +/# together ("node.js", "c++", "c#")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*[+#]*", re.IGNORECASE)
+
+# One hit in a text: canonical name, its category and the character offsets [start, end)
+SkillMatch = namedtuple("SkillMatch", ["skill", "category", "start", "end"])
+
+
+def tokenize(text):
+    """Yield (lowercased token, start, end) for every token in text."""
+    for m in TOKEN_RE.finditer(text):
+        yield m.group().lower(), m.start(), m.end()
+
+
+class SkillMatcher:
+    """
+    Compiles every synonym in the taxonomy into one token trie, then finds all
+    leftmost-longest matches in a single pass over the text. Each step only
+    follows trie edges, so matching time depends on the text length (and the
+    longest synonym), not on how many skills the taxonomy holds.
+    """
+
+    def __init__(self, taxonomy):
+        # taxonomy: {category: {canonical name: [synonym, ...]}}
+        self._root = {}
+        self.canonical = {}  # category -> [canonical names in file order]
+        for category, entries in taxonomy.items():
+            self.canonical[category] = list(entries)
+            for canonical, synonyms in entries.items():
+                for phrase in [canonical] + list(synonyms):
+                    self._add(phrase, canonical, category)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a taxonomy JSON file ({"version": 1, "categories": {...}})."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["categories"])
+
+    def _add(self, phrase, canonical, category):
+        tokens = [token for token, _, _ in tokenize(phrase)]
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # None marks the end of a phrase: {category: canonical name}, as one phrase may be in several
+        ends = node.setdefault(None, {})
+        ends.pop(category, None)  # Re-adding moves the category last, so the latest entry wins
+        ends[category] = canonical
+
+    def find(self, text, category=None):
+        """
+        Return SkillMatch hits in text order, without overlaps (longest phrase
+        wins). With a category only its phrases are candidates, so a longer
+        phrase of another category cannot hide a match in this one.
+        """
+        tokens = list(tokenize(text))
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            best = None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                ends = node.get(None)
+                if ends:
+                    if category is None:
+                        best = (*next(reversed(ends.items())), j)
+                    elif category in ends:
+                        best = (category, ends[category], j)
+                j += 1
+            if best is None:
+                i += 1
+                continue
+            cat, canonical, last = best
+            matches.append(SkillMatch(canonical, cat, tokens[i][1], tokens[last][2]))
+            i = last + 1
+        return matches
+
+    def skills_in(self, text, category=None):
+        """Distinct canonical names found in text, in order of first appearance."""
+        return list(dict.fromkeys(match.skill for match in self.find(text, category)))
+
+    def count(self, category=None):
+        """Number of canonical entries (in one category, or in all of them)."""
+        if category is not None:
+            return len(self.canonical.get(category, []))
+        return sum(len(names) for names in self.canonical.values())
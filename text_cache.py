@@ -0,0 +1,147 @@
+# text_cache.py - Content-addressed store for text extracted from resume PDFs
+
+import hashlib
+import os
+import threading
+
+CHUNK_SIZE = 1024 * 1024  # Read files in 1 MB blocks when hashing
+
+
+def file_sha256(filepath):
+    """Return the hex SHA-256 of a file's bytes, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeTextCache:
+    """
+    Keeps the extracted text of each resume PDF on disk, keyed by the SHA-256
+    of the PDF bytes, so a resume is only parsed once no matter how many jobs
+    it is screened against.
+
+    Entries are stored as <hash>.txt inside cache_dir. When the total size of
+    the entries goes over max_bytes, the least recently used ones are evicted.
+    """
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Computed lazily from the directory contents
+        self.hits = 0  # get_or_extract lookups since this process started
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, content_hash):
+        return os.path.join(self.cache_dir, f"{content_hash}.txt")
+
+    def get(self, content_hash):
+        """Return the cached text for a content hash, or None on a miss."""
+        path = self._entry_path(content_hash)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return text
+
+    def put(self, content_hash, text):
+        """Store text under a content hash, evicting old entries if needed."""
+        path = self._entry_path(content_hash)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data = text.encode("utf-8")
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)  # Atomic, so readers never see half a file
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - old_size
+            self._evict()
+
+    def get_or_extract(self, filepath, extractor, content_hash=None):
+        """
+        Return the text of a PDF, calling extractor(filepath) only when the
+        file's content hash is not cached yet. Empty results are not cached
+        so a failed parse is retried next time. Pass content_hash when it is
+        already known (e.g. hashed while uploading) to skip re-reading the file.
+        """
+        if content_hash is None:
+            try:
+                content_hash = file_sha256(filepath)
+            except OSError as e:
+                print("Resume text cache error:", e)
+                return extractor(filepath)
+
+        text = self.get(content_hash)
+        with self._lock:
+            if text is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if text is not None:
+            return text
+
+        text = extractor(filepath)
+        if text:
+            try:
+                self.put(content_hash, text)
+            except OSError as e:
+                print("Resume text cache error:", e)
+        return text
+
+    def invalidate(self, content_hash):
+        """Drop the cached text for a content hash, if any."""
+        path = self._entry_path(content_hash)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def invalidate_file(self, filepath):
+        """Drop the cached text for a PDF that is about to be removed."""
+        try:
+            self.invalidate(file_sha256(filepath))
+        except OSError as e:
+            print("Resume text cache error:", e)
+
+    def _evict(self):
+        # Caller must hold self._lock
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, _, size in self._scan())
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # Oldest access time first
+        for path, _, size in sorted(self._scan(), key=lambda entry: entry[1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+
+    def _scan(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((entry.path, st.st_mtime, st.st_size))
+        return entries
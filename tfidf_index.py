@@ -0,0 +1,282 @@
+# tfidf_index.py - Corpus-level TF-IDF model over all resumes and job descriptions
+
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+# scipy and scikit-learn are imported on first use: together they add most of a
+# second to startup, which migrations and admin scripts should not pay
+
+try:
+    import fcntl  # Not available on Windows; the index then relies on the thread lock only
+except ImportError:
+    fcntl = None
+
+# Bump whenever the on-disk layout changes; older files are ignored and need a rebuild
+FORMAT_VERSION = 1
+
+
+class TfidfIndex:
+    """
+    Maintained vocabulary, document frequencies and raw term counts for every
+    indexed document (keys such as "resume:12" or "job:3").
+
+    IDF is computed over the whole corpus (smooth IDF, same formula as
+    scikit-learn's TfidfVectorizer), so scores are comparable across pairs and
+    a match score is just the dot product of two L2-normalised TF-IDF vectors.
+    The index is saved as a single .npz file holding the CSR components of the
+    count matrix plus the vocabulary.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._analyzer = None
+        self._lock = threading.RLock()
+        self._loaded_mtime = None
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary = {}  # term -> column
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.docs = {}  # key -> (column indices, term counts)
+        self._vectors = {}  # key -> weighted vector, cleared whenever IDF changes
+
+    # -------------------- PERSISTENCE --------------------
+    @classmethod
+    def load(cls, path):
+        """Load the index from disk, or start empty if the file is missing or outdated."""
+        index = cls(path)
+        index.refresh()
+        return index
+
+    def preload(self):
+        """Import scikit-learn/scipy and read the index now instead of on first use."""
+        from scipy import sparse  # noqa: F401
+        self._get_analyzer()
+        self.refresh()
+
+    def refresh(self):
+        """Reload from disk if another process saved a newer copy."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        with self._lock:
+            if mtime == self._loaded_mtime:
+                return
+            try:
+                self._read(self.path)
+            except Exception as e:
+                print("TF-IDF index load error (run 'flask rebuild-tfidf-index'):", e)
+                self._reset()
+            self._loaded_mtime = mtime
+
+    def _read(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"format version {version}, expected {FORMAT_VERSION}")
+            terms = data["terms"].tolist()
+            keys = data["keys"].tolist()
+            indptr, indices, counts = data["indptr"], data["indices"], data["counts"]
+            self.vocabulary = {term: col for col, term in enumerate(terms)}
+            self.doc_freq = data["doc_freq"].astype(np.int64)
+            self.docs = {
+                key: (indices[indptr[row]:indptr[row + 1]], counts[indptr[row]:indptr[row + 1]])
+                for row, key in enumerate(keys)
+            }
+            self._vectors = {}
+
+    def save(self):
+        """Write the index atomically so readers never see a partial file."""
+        with self._lock:
+            keys = list(self.docs)
+            terms = sorted(self.vocabulary, key=self.vocabulary.get)
+            rows = [self.docs[key] for key in keys]
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+            indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+            counts = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0)
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                version=np.array(FORMAT_VERSION),
+                terms=np.array(terms, dtype=str),
+                doc_freq=self.doc_freq,
+                keys=np.array(keys, dtype=str),
+                indptr=indptr,
+                indices=indices,
+                counts=counts,
+            )
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
+
+    def _file_lock(self):
+        return file_lock(self.path)
+
+    # -------------------- UPDATES --------------------
+    def _get_analyzer(self):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(stop_words='english').build_analyzer()
+        return self._analyzer
+
+    def _count_terms(self, text, grow):
+        counts = {}
+        unknown = []
+        for term in self._get_analyzer()(text):
+            col = self.vocabulary.get(term)
+            if col is None:
+                if not grow:
+                    unknown.append(term)
+                    continue
+                col = len(self.vocabulary)
+                self.vocabulary[term] = col
+            counts[col] = counts.get(col, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return indices, values, unknown
+
+    def _add(self, key, text):
+        self._remove(key)
+        indices, values, _ = self._count_terms(text, grow=True)
+        if len(self.vocabulary) > len(self.doc_freq):
+            grown = np.zeros(len(self.vocabulary), dtype=np.int64)
+            grown[:len(self.doc_freq)] = self.doc_freq
+            self.doc_freq = grown
+        self.doc_freq[indices] += 1
+        self.docs[key] = (indices, values)
+
+    def _remove(self, key):
+        doc = self.docs.pop(key, None)
+        if doc is not None:
+            self.doc_freq[doc[0]] -= 1
+
+    def update(self, add=None, remove=()):
+        """
+        Add/replace documents ({key: text}) and remove keys, then save once.
+        Picks up changes saved by other processes first so none are lost.
+        """
+        with self._lock, self._file_lock():
+            self.refresh()
+            for key in remove:
+                self._remove(key)
+            for key, text in (add or {}).items():
+                self._add(key, text)
+            self._vectors = {}
+            self.save()
+
+    def rebuild(self, documents):
+        """Replace the whole index (vocabulary included) with {key: text} and save."""
+        with self._lock, self._file_lock():
+            self._reset()
+            for key, text in documents.items():
+                self._add(key, text)
+            self.save()
+
+    def add_document(self, key, text):
+        self.update(add={key: text})
+
+    def remove_document(self, key):
+        self.update(remove=[key])
+
+    def __contains__(self, key):
+        return key in self.docs
+
+    def __len__(self):
+        return len(self.docs)
+
+    # -------------------- SCORING --------------------
+    def _idf(self, doc_freq):
+        n_docs = len(self.docs)
+        return np.log((1 + n_docs) / (1 + doc_freq)) + 1
+
+    def _weighted(self, indices, values, extra_sq_norm=0.0):
+        from scipy import sparse
+        weights = values * self._idf(self.doc_freq[indices])
+        norm = np.sqrt(np.dot(weights, weights) + extra_sq_norm)
+        if norm > 0:
+            weights = weights / norm
+        order = np.argsort(indices)
+        return sparse.csr_matrix(
+            (weights[order], indices[order], [0, len(indices)]),
+            shape=(1, len(self.vocabulary))
+        )
+
+    def vector(self, key):
+        """Return the stored L2-normalised TF-IDF row for a key, or None if not indexed."""
+        with self._lock:
+            vec = self._vectors.get(key)
+            if vec is None and key in self.docs:
+                vec = self._weighted(*self.docs[key])
+                self._vectors[key] = vec
+            return vec
+
+    def vectorize(self, text):
+        """
+        TF-IDF row for text that is not in the index (e.g. a free-text job
+        description). Terms outside the vocabulary cannot match anything but
+        still count towards the vector norm, so the cosine stays exact.
+        """
+        with self._lock:
+            indices, values, unknown = self._count_terms(text, grow=False)
+            unknown_sq_norm = 0.0
+            if unknown:
+                unknown_idf = self._idf(0)
+                _, counts = np.unique(unknown, return_counts=True)
+                unknown_sq_norm = float(np.sum((counts * unknown_idf) ** 2))
+            return self._weighted(indices, values, unknown_sq_norm)
+
+    def matrix(self, keys):
+        """Stack the TF-IDF rows of several keys into one CSR matrix (unindexed keys give empty rows)."""
+        from scipy import sparse
+        with self._lock:
+            width = len(self.vocabulary)
+            if not keys:
+                return sparse.csr_matrix((0, width))
+            rows = []
+            for key in keys:
+                row = self.vector(key)
+                rows.append(sparse.csr_matrix((1, width)) if row is None else _widen(row, width))
+            return sparse.vstack(rows).tocsr()
+
+    def scores(self, keys, query_vector):
+        """Cosine similarity of every key's row against one query row, as a dense array."""
+        matrix = self.matrix(keys)
+        query_vector = _widen(query_vector, matrix.shape[1])
+        # Rows are L2-normalised, so the dot product IS the cosine similarity
+        return (matrix @ query_vector.T).toarray().ravel()
+
+    @staticmethod
+    def similarity(vec_a, vec_b):
+        """Cosine similarity of two rows produced by this index."""
+        width = max(vec_a.shape[1], vec_b.shape[1])
+        vec_a, vec_b = _widen(vec_a, width), _widen(vec_b, width)
+        return float((vec_a @ vec_b.T).toarray()[0, 0])
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on path + ".lock"; serialises read-modify-write cycles between gunicorn workers."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _widen(row, width):
+    # Vectors built before the vocabulary grew are narrower; pad them with empty columns
+    if row.shape[1] == width:
+        return row
+    row = row.tocsr(copy=True)
+    row.resize((row.shape[0], width))
+    return row
@@ -0,0 +1,170 @@
+# upload_stream.py - Stream uploaded files to disk in chunks while hashing and validating them
+
+import hashlib
+import os
+import tempfile
+
+from flask import Request, current_app
+
+CHUNK_SIZE = 64 * 1024  # Same block size Werkzeug's multipart parser writes in
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+SIGNATURES = {"PDF": PDF_MAGIC, "ZIP": ZIP_MAGIC}  # Accepted kinds and their leading bytes
+
+
+class UploadRejected(Exception):
+    """The uploaded file failed the size or file-type check."""
+
+
+class SpooledUpload:
+    """
+    Writable file that receives one uploaded file part as it is parsed.
+
+    Chunks go straight to a temp file inside the destination folder (so the
+    final move is an atomic rename on the same filesystem) while the SHA-256,
+    the size and the file signature (PDF by default) are tracked. Once a chunk breaks a rule the
+    rest of the upload is discarded instead of written, so memory use is one
+    chunk and disk use is bounded by max_bytes whatever the client sends.
+    """
+
+    def __init__(self, directory, max_bytes=None, kind="PDF"):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix=".upload-", suffix=".part", dir=directory)
+        self._file = os.fdopen(fd, "w+b")
+        self._digest = hashlib.sha256()
+        self._head = b""
+        self.kind = kind
+        self._magic = SIGNATURES[kind]
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.error = None
+        self.committed = False
+
+    # --- file protocol used by Werkzeug / FileStorage ---
+    def write(self, data):
+        self.size += len(data)
+        if self.error is None:
+            if len(self._head) < len(self._magic):
+                self._head += bytes(data[:len(self._magic) - len(self._head)])
+                if not self._magic.startswith(self._head):
+                    self._reject(f"Only {self.kind} files can be uploaded.")
+            if self.max_bytes is not None and self.size > self.max_bytes:
+                self._reject(f"File is larger than {self.max_bytes // (1024 * 1024)} MB.")
+        if self.error is None:
+            self._digest.update(data)
+            self._file.write(data)
+        return len(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readline(self, size=-1):
+        return self._file.readline(size)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        """Close the temp file and delete it unless it was committed."""
+        if not self._file.closed:
+            self._file.close()
+        if not self.committed:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    # --- validation and commit ---
+    def _reject(self, message):
+        self.error = message
+        self._file.seek(0)
+        self._file.truncate()  # Drop what was written so far
+
+    @property
+    def sha256(self):
+        """Hex SHA-256 of everything written (valid once the upload is complete)."""
+        return self._digest.hexdigest()
+
+    def check(self):
+        """Raise UploadRejected if the finished upload is empty, too large or of the wrong kind."""
+        if self.error is None and self._head != self._magic:
+            self.error = f"Only {self.kind} files can be uploaded." if self.size else "The uploaded file is empty."
+        if self.error is not None:
+            raise UploadRejected(self.error)
+
+    def commit(self, destination):
+        """Validate, then atomically move the file to destination and return its SHA-256."""
+        self.check()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.path, destination)
+        self.committed = True
+        return self.sha256
+
+
+def spool_stream(stream, directory, max_bytes=None, kind="PDF"):
+    """Copy any readable binary stream into a new SpooledUpload, chunk by chunk."""
+    upload = SpooledUpload(directory, max_bytes, kind)
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        upload.write(chunk)
+        if upload.error is not None:
+            break  # Already rejected; don't read (or decompress) the rest
+    return upload
+
+
+def spooled_upload(file_storage, directory, max_bytes=None, kind="PDF"):
+    """
+    The SpooledUpload behind a request.files entry. Files that were not parsed
+    by StreamingUploadRequest (e.g. built by hand) are copied chunk by chunk.
+    """
+    if isinstance(file_storage.stream, SpooledUpload):
+        return file_storage.stream
+    upload = spool_stream(file_storage.stream, directory, max_bytes, kind)
+    file_storage.stream = upload  # Closed (and cleaned up) with the request
+    return upload
+
+
+def accepts_upload(kind="PDF", max_bytes=None):
+    """
+    Let one view accept another kind of file (e.g. ZIP) and/or a different size
+    limit than RESUME_MAX_BYTES; MAX_CONTENT_LENGTH is raised to match.
+    """
+    def decorator(view):
+        view.upload_kind = kind
+        view.upload_max_bytes = max_bytes
+        return view
+    return decorator
+
+
+class StreamingUploadRequest(Request):
+    """
+    Request class whose multipart parser writes each uploaded file straight
+    into a SpooledUpload in UPLOAD_SPOOL_DIR instead of a memory/temp spool.
+    Uncommitted temp files are deleted when Flask closes the request.
+    """
+
+    def _view(self):
+        # The view handling this request (carries the accepts_upload settings, if any)
+        return current_app.view_functions.get(self.endpoint) if current_app else None
+
+    @property
+    def max_content_length(self):
+        max_bytes = getattr(self._view(), "upload_max_bytes", None)
+        if max_bytes:
+            return max_bytes + 64 * 1024  # + room for form fields
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        view = self._view()
+        max_bytes = getattr(view, "upload_max_bytes", None) or current_app.config['RESUME_MAX_BYTES']
+        return SpooledUpload(current_app.config['UPLOAD_SPOOL_DIR'], max_bytes, getattr(view, "upload_kind", "PDF"))